@@ -1,6 +1,12 @@
+from collections import Counter
+
 from django.contrib import admin
+from django.db import transaction
 
 from .models import Category, Genre, Comment, Review, Title, User
+from .ratings import change_rating
+
+RATING_FIELDS = ('rating_sum', 'rating_count', 'rating')
 
 
 @admin.register(Review)
@@ -9,11 +15,50 @@ class ReviewAdmin(admin.ModelAdmin):
     list_filter = ('title', )
     search_fields = ('text', )
 
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        if change:
+            old_title_id, old_score = Review.objects.select_for_update(
+            ).values_list('title_id', 'score').get(pk=obj.pk)
+        super().save_model(request, obj, form, change)
+        if not change:
+            change_rating(obj.title_id, obj.score, 1)
+        elif old_title_id == obj.title_id:
+            change_rating(obj.title_id, obj.score - old_score)
+        else:
+            change_rating(old_title_id, -old_score, -1)
+            change_rating(obj.title_id, obj.score, 1)
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Review.objects.filter(pk=obj.pk))
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        scores, counts = Counter(), Counter()
+        for title_id, score in queryset.select_for_update().values_list(
+                'title_id', 'score').order_by():
+            scores[title_id] += score
+            counts[title_id] += 1
+        queryset.delete()
+        for title_id, count in counts.items():
+            change_rating(title_id, -scores[title_id], -count)
+
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     list_display = ('name', 'year', )
+    readonly_fields = RATING_FIELDS
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            obj.save(update_fields=[
+                field.name for field in obj._meta.concrete_fields
+                if field.name in form.changed_data
+            ])
+        else:
+            super().save_model(request, obj, form, change)
 
 
 @admin.register(Category)
@@ -1,6 +1,9 @@
 import django_filters as filters
+from django.db.models import Case, IntegerField, Value, When
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
 from .models import Title
+from .search import search
 
 
 class TitleFilter(filters.FilterSet):
@@ -9,7 +12,36 @@ class TitleFilter(filters.FilterSet):
         field_name='category__slug', lookup_expr='iexact')
     genre = filters.CharFilter(field_name='genre__slug', lookup_expr='iexact')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    rating_min = filters.NumberFilter(method='filter_rating_min')
 
     class Meta:
-        fields = ('name', 'category', 'genre', 'year')
+        fields = ('name', 'category', 'genre', 'year', 'rating_min')
         model = Title
+
+    def filter_rating_min(self, queryset, name, value):
+        return queryset.filter(rating__gte=value, rating_count__gt=0)
+
+
+class TitleOrderingFilter(OrderingFilter):
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and ordering[-1].lstrip('-') == 'rating':
+            ordering = (*ordering, ordering[-1].replace('rating', 'id'))
+        if ordering and 'rating' in ordering:
+            position = ordering.index('rating')
+            unrated_last = Case(When(rating_count=0, then=Value(1)),
+                                default=Value(0), output_field=IntegerField())
+            return (*ordering[:position], unrated_last.asc(),
+                    *ordering[position:])
+        return ordering
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search(queryset, query)
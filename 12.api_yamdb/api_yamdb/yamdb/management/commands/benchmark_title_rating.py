@@ -0,0 +1,126 @@
+import random
+import statistics
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from yamdb.models import Category, Review, Title, User
+from yamdb.ratings import recompute_ratings
+
+BATCH_SIZE = 10000
+AUTHORS = 1000
+WORDS = (
+    'драма', 'комедия', 'история', 'любовь', 'война', 'детектив', 'город',
+    'море', 'дорога', 'семья', 'тайна', 'остров', 'зима', 'лето', 'ночь',
+    'музыка', 'дом', 'сердце', 'герой', 'космос', 'время', 'судьба',
+    'побег', 'путешествие', 'мечта', 'память', 'огонь', 'лес', 'небо',
+    'королева', 'сыщик', 'школа', 'поезд', 'письмо', 'сад', 'ветер',
+    'река', 'граница', 'тень', 'свет',
+)
+
+
+def get_text(generator, length):
+    return ' '.join(generator.choices(WORDS, k=length))
+
+
+def fill_titles(generator, titles, reviews):
+    category = Category.objects.create(name='benchmark',
+                                       slug='benchmark-title')
+    User.objects.bulk_create(
+        User(username=f'benchmark_title_{index}',
+             email=f'benchmark_title_{index}@yamdb.local')
+        for index in range(AUTHORS)
+    )
+    author_ids = list(User.objects.filter(
+        username__startswith='benchmark_title_'
+    ).values_list('pk', flat=True))
+    for start in range(0, titles, BATCH_SIZE):
+        Title.objects.bulk_create(
+            Title(name=f'{get_text(generator, 2)} benchmark{index}',
+                  description=get_text(generator, 8),
+                  year=generator.randint(1950, 2020), category=category)
+            for index in range(start, min(start + BATCH_SIZE, titles))
+        )
+    title_ids = list(Title.objects.filter(
+        category=category).values_list('pk', flat=True).order_by('pk'))
+    counts = Counter(generator.randrange(len(title_ids))
+                     for _ in range(reviews))
+    batch = []
+    for position, title_id in enumerate(title_ids):
+        quality = generator.randint(1, 10)
+        for author_id in generator.sample(
+                author_ids, min(counts[position], AUTHORS)):
+            batch.append(Review(
+                title_id=title_id, author_id=author_id,
+                text=get_text(generator, 6),
+                score=min(max(quality + generator.randint(-2, 2), 1), 10)))
+        if len(batch) >= BATCH_SIZE:
+            Review.objects.bulk_create(batch)
+            batch = []
+    Review.objects.bulk_create(batch)
+    recompute_ratings(BATCH_SIZE)
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for model in (Title, Review, User):
+                cursor.execute(f'ANALYZE {model._meta.db_table}')
+    return title_ids
+
+
+def report(stdout, client, label, url, repeat):
+    latencies = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise CommandError(f'{url}: код ответа {response.status_code}')
+    latencies.sort()
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    stdout.write(
+        f'  {label}: медиана '
+        f'{statistics.median(latencies) * 1000:.1f} мс, '
+        f'95% {p95 * 1000:.1f} мс, '
+        f'запросов {len(context.captured_queries)}')
+
+
+class Command(BaseCommand):
+    help = ('Измеряет задержку списка произведений с сортировкой по '
+            'рейтингу и фильтром rating_min на временных произведениях '
+            'и отзывах, которые затем откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100000,
+                            help='Сколько временных произведений добавить')
+        parser.add_argument('--reviews', type=int, default=1000000,
+                            help='Сколько временных отзывов добавить')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Количество замеров каждого запроса')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--host', default='localhost')
+
+    def handle(self, *args, **options):
+        if options['titles'] < 1:
+            raise CommandError('Нужно добавить хотя бы одно произведение')
+        generator = random.Random(options['seed'])
+        with transaction.atomic():
+            started = time.perf_counter()
+            fill_titles(generator, options['titles'], options['reviews'])
+            self.stdout.write(
+                f'Произведений: {Title.objects.count()}, отзывов: '
+                f'{Review.objects.count()}, заполнение за '
+                f'{time.perf_counter() - started:.1f} с')
+            client = APIClient(HTTP_HOST=options['host'])
+            for label, query in (
+                    ('топ по рейтингу', '?ordering=-rating'),
+                    ('rating_min=9', '?rating_min=9'),
+                    ('rating_min=5', '?rating_min=5'),
+                    ('rating_min=9 и сортировка по рейтингу',
+                     '?rating_min=9&ordering=-rating')):
+                report(self.stdout, client, label,
+                       '/api/v1/titles/' + query, options['repeat'])
+            transaction.set_rollback(True)
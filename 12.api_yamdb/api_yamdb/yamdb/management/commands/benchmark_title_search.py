@@ -0,0 +1,63 @@
+import random
+import time
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from rest_framework.test import APIClient
+
+from yamdb.models import Review, Title
+
+from .benchmark_title_rating import fill_titles, report
+
+BACKENDS = {
+    'postgresql': 'PostgreSQL, to_tsvector и GIN-индекс',
+    'sqlite': 'SQLite FTS5',
+}
+
+
+class Command(BaseCommand):
+    help = ('Измеряет задержку полнотекстового поиска по произведениям и '
+            'отзывам на временных данных, которые затем откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=200000,
+                            help='Сколько временных произведений добавить')
+        parser.add_argument('--reviews', type=int, default=1000000,
+                            help='Сколько временных отзывов добавить')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Количество замеров каждого запроса')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--host', default='localhost')
+
+    def handle(self, *args, **options):
+        if options['titles'] < 1:
+            raise CommandError('Нужно добавить хотя бы одно произведение')
+        generator = random.Random(options['seed'])
+        with transaction.atomic():
+            started = time.perf_counter()
+            fill_titles(generator, options['titles'], options['reviews'])
+            self.stdout.write(
+                f'{BACKENDS.get(connection.vendor, "поиск через icontains")}'
+                f', произведений: {Title.objects.count()}, отзывов: '
+                f'{Review.objects.count()}, заполнение за '
+                f'{time.perf_counter() - started:.1f} с')
+            client = APIClient(HTTP_HOST=options['host'])
+            for label, query in (
+                    ('частое слово', 'драма'),
+                    ('два слова', 'драма город'),
+                    ('редкое слово', f'benchmark{options["titles"] // 2}'),
+                    ('нет совпадений', 'отсутствует')):
+                report(self.stdout, client, f'произведения, {label}',
+                       '/api/v1/titles/?' + urlencode({'search': query}),
+                       options['repeat'])
+            busiest = Review.objects.values_list('title').annotate(
+                reviews=Count('id')).order_by('-reviews').first()
+            if busiest is not None:
+                report(self.stdout, client,
+                       'отзывы произведения, частое слово',
+                       f'/api/v1/titles/{busiest[0]}/reviews/?'
+                       + urlencode({'search': 'драма'}),
+                       options['repeat'])
+            transaction.set_rollback(True)
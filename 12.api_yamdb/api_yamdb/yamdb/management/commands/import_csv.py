@@ -0,0 +1,126 @@
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from yamdb.models import Category, Comment, Genre, Review, Title, User
+from yamdb.ratings import recompute_ratings
+
+DATA_DIR = os.path.join(os.path.dirname(settings.BASE_DIR), 'data')
+
+TABLES = {
+    'users.csv': (User, {'description': 'bio'}),
+    'category.csv': (Category, {}),
+    'genre.csv': (Genre, {}),
+    'titles.csv': (Title, {'category': 'category_id'}),
+    'genre_title.csv': (Title.genre.through, {}),
+    'review.csv': (Review, {'author': 'author_id'}),
+    'comments.csv': (Comment, {'author': 'author_id'}),
+}
+
+STAGES = (
+    ('users.csv', 'category.csv', 'genre.csv'),
+    ('titles.csv',),
+    ('genre_title.csv', 'review.csv'),
+    ('comments.csv',),
+)
+
+
+@contextmanager
+def keep_auto_now_add(*models):
+    fields = [field for model in models for field in model._meta.fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов каталога data/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=DATA_DIR,
+                            help='Каталог с CSV-файлами')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Количество строк в одном INSERT')
+        parser.add_argument('--parallel', action='store_true',
+                            help='Загружать независимые таблицы '
+                                 'одновременно')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        missing = [filename for filename in TABLES
+                   if not os.path.isfile(os.path.join(path, filename))]
+        if missing:
+            raise CommandError(
+                f'В каталоге {path} нет файлов: {", ".join(missing)}')
+        if options['parallel'] and connection.vendor == 'sqlite':
+            raise CommandError('SQLite не поддерживает параллельную запись, '
+                               'запустите команду без --parallel')
+        self.path = path
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+        with keep_auto_now_add(Review, Comment):
+            for stage in STAGES:
+                if options['parallel'] and len(stage) > 1:
+                    with ThreadPoolExecutor(len(stage)) as executor:
+                        list(executor.map(self.load_in_thread, stage))
+                else:
+                    for filename in stage:
+                        self.load_table(filename)
+        self.reset_sequences()
+        recompute_ratings(self.batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка завершена за {time.perf_counter() - started:.2f} с'))
+
+    def load_in_thread(self, filename):
+        try:
+            self.load_table(filename)
+        finally:
+            connection.close()
+
+    def read_rows(self, filename):
+        model, renamed = TABLES[filename]
+        defaults = {'password': make_password(None)} if model is User else {}
+        with open(os.path.join(self.path, filename), encoding='utf-8',
+                  newline='') as csv_file:
+            for row in csv.DictReader(csv_file):
+                yield model(**defaults, **{renamed.get(column, column): value
+                                           for column, value in row.items()})
+
+    @transaction.atomic
+    def load_table(self, filename):
+        model, _ = TABLES[filename]
+        rows = self.read_rows(filename)
+        started = time.perf_counter()
+        existing = model.objects.count()
+        count = 0
+        batch = list(islice(rows, self.batch_size))
+        while batch:
+            model.objects.bulk_create(batch, ignore_conflicts=True)
+            count += len(batch)
+            batch = list(islice(rows, self.batch_size))
+        skipped = count - (model.objects.count() - existing)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{filename}: {count} строк за {elapsed:.2f} с '
+            f'({count / elapsed if elapsed else 0:.0f} строк/с), '
+            f'пропущено как дубликаты: {skipped}')
+
+    def reset_sequences(self):
+        models = [model for model, _ in TABLES.values()]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from yamdb.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг всех произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Количество произведений в одном UPDATE')
+
+    def handle(self, *args, **options):
+        changed = recompute_ratings(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлён рейтинг произведений: {changed}'))
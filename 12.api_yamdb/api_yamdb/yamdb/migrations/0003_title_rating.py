@@ -0,0 +1,38 @@
+# Generated by Django 2.2.6 on 2026-10-17 15:32
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Review = apps.get_model('yamdb', 'Review')
+    Title = apps.get_model('yamdb', 'Title')
+    ratings = Review.objects.values_list('title').annotate(
+        Sum('score'), Count('id')).order_by()
+    titles = []
+    for title_id, rating_sum, rating_count in ratings.iterator():
+        titles.append(Title(id=title_id, rating_sum=rating_sum,
+                            rating_count=rating_count))
+    Title.objects.bulk_update(titles, ('rating_sum', 'rating_count'),
+                              batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0002_auto_20210724_1052'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.6 on 2026-10-17 15:33
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('yamdb', 'Title')
+    Title.objects.update(rating=Coalesce(
+        ExpressionWrapper(Cast(F('rating_sum'), FloatField())
+                          / NullIf(F('rating_count'), Value(0)),
+                          output_field=FloatField()),
+        Value(0.0)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(default=0, verbose_name='Рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-rating', '-id'], name='title_rating_idx'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+SEARCH_FIELDS = {
+    'yamdb_title': ('name', 'description'),
+    'yamdb_review': ('text',),
+}
+
+
+def get_postgresql_sql(table, fields):
+    columns = " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+    return (
+        f'CREATE INDEX {table}_search_idx ON {table} '
+        f"USING gin ((to_tsvector('russian', {columns})))",
+    ), (f'DROP INDEX IF EXISTS {table}_search_idx',)
+
+
+def get_sqlite_sql(table, fields):
+    fts = f'{table}_fts'
+    columns = ', '.join(fields)
+    new_values = ', '.join(f'new.{field}' for field in fields)
+    old_values = ', '.join(f'old.{field}' for field in fields)
+    insert = (f'INSERT INTO {fts}(rowid, {columns}) '
+              f'VALUES (new.id, {new_values});')
+    delete = (f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+              f"VALUES ('delete', old.id, {old_values});")
+    return (
+        f'CREATE VIRTUAL TABLE {fts} USING fts5({columns}, '
+        f"content='{table}', content_rowid='id')",
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END',
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END',
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} '
+        f'BEGIN {delete} {insert} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ), (
+        f'DROP TRIGGER IF EXISTS {fts}_ai',
+        f'DROP TRIGGER IF EXISTS {fts}_ad',
+        f'DROP TRIGGER IF EXISTS {fts}_au',
+        f'DROP TABLE IF EXISTS {fts}',
+    )
+
+
+SQL_BUILDERS = {
+    'postgresql': get_postgresql_sql,
+    'sqlite': get_sqlite_sql,
+}
+
+
+def run_search_sql(schema_editor, reverse):
+    get_sql = SQL_BUILDERS.get(schema_editor.connection.vendor)
+    if get_sql is None:
+        return
+    for table, fields in SEARCH_FIELDS.items():
+        for statement in get_sql(table, fields)[reverse]:
+            schema_editor.execute(statement)
+
+
+def create_search(apps, schema_editor):
+    run_search_sql(schema_editor, reverse=False)
+
+
+def drop_search(apps, schema_editor):
+    run_search_sql(schema_editor, reverse=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0004_title_rating_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search, drop_search),
+    ]
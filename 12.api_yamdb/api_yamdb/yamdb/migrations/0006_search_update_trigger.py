@@ -0,0 +1,50 @@
+from django.db import migrations
+
+SEARCH_FIELDS = {
+    'yamdb_title': ('name', 'description'),
+    'yamdb_review': ('text',),
+}
+
+
+def get_update_trigger(table, fields, columns_only):
+    fts = f'{table}_fts'
+    columns = ', '.join(fields)
+    new_values = ', '.join(f'new.{field}' for field in fields)
+    old_values = ', '.join(f'old.{field}' for field in fields)
+    insert = (f'INSERT INTO {fts}(rowid, {columns}) '
+              f'VALUES (new.id, {new_values});')
+    delete = (f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+              f"VALUES ('delete', old.id, {old_values});")
+    update_of = f'UPDATE OF {columns}' if columns_only else 'UPDATE'
+    return (
+        f'DROP TRIGGER IF EXISTS {fts}_au',
+        f'CREATE TRIGGER {fts}_au AFTER {update_of} ON {table} '
+        f'BEGIN {delete} {insert} END',
+    )
+
+
+def replace_update_triggers(schema_editor, columns_only):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, fields in SEARCH_FIELDS.items():
+        for statement in get_update_trigger(table, fields, columns_only):
+            schema_editor.execute(statement)
+
+
+def limit_update_triggers(apps, schema_editor):
+    replace_update_triggers(schema_editor, columns_only=True)
+
+
+def widen_update_triggers(apps, schema_editor):
+    replace_update_triggers(schema_editor, columns_only=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0005_full_text_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(limit_update_triggers, widen_update_triggers),
+    ]
@@ -65,11 +65,18 @@ class Title(models.Model):
     category = models.ForeignKey(Category, blank=True,
                                  on_delete=models.SET_NULL,
                                  related_name='titles', null=True)
+    rating_sum = models.PositiveIntegerField(
+        default=0, verbose_name='Сумма оценок')
+    rating_count = models.PositiveIntegerField(
+        default=0, verbose_name='Количество оценок')
+    rating = models.FloatField(default=0, verbose_name='Рейтинг')
 
     class Meta:
         verbose_name = 'Название'
         verbose_name_plural = 'Названия'
         ordering = ('-year',)
+        indexes = (models.Index(fields=('-rating', '-id'),
+                                name='title_rating_idx'),)
 
     def __str__(self):
         return self.name
@@ -0,0 +1,49 @@
+from collections import defaultdict
+
+from django.db.models import (Count, ExpressionWrapper, F, FloatField, Sum,
+                              Value)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .models import Review, Title
+
+
+def get_rating(rating_sum, rating_count):
+    return Coalesce(
+        ExpressionWrapper(Cast(rating_sum, FloatField())
+                          / NullIf(rating_count, Value(0)),
+                          output_field=FloatField()),
+        Value(0.0)
+    )
+
+
+def change_rating(title_id, score_delta, count_delta=0):
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(id=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=get_rating(rating_sum, rating_count)
+    )
+
+
+def recompute_ratings(batch_size=1000):
+    ratings = {
+        title_id: (rating_sum, rating_count)
+        for title_id, rating_sum, rating_count in Review.objects.values_list(
+            'title').annotate(Sum('score'), Count('id')).order_by()
+    }
+    changed = defaultdict(list)
+    titles = Title.objects.values_list(
+        'id', 'rating_sum', 'rating_count', 'rating').order_by()
+    for title_id, *stored in titles.iterator():
+        rating_sum, rating_count = ratings.get(title_id, (0, 0))
+        rating = rating_sum / rating_count if rating_count else 0
+        if stored != [rating_sum, rating_count, rating]:
+            changed[rating_sum, rating_count, rating].append(title_id)
+    for (rating_sum, rating_count, rating), title_ids in changed.items():
+        for start in range(0, len(title_ids), batch_size):
+            Title.objects.filter(
+                id__in=title_ids[start:start + batch_size]
+            ).update(rating_sum=rating_sum, rating_count=rating_count,
+                     rating=rating)
+    return sum(len(title_ids) for title_ids in changed.values())
@@ -0,0 +1,68 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+SEARCH_CONFIG = 'russian'
+
+SEARCH_FIELDS = {
+    'yamdb_title': ('name', 'description'),
+    'yamdb_review': ('text',),
+}
+
+
+def get_document(table):
+    columns = " || ' ' || ".join(
+        f'coalesce("{table}"."{field}", \'\')'
+        for field in SEARCH_FIELDS[table]
+    )
+    return f"to_tsvector('{SEARCH_CONFIG}', {columns})"
+
+
+def search_postgresql(queryset, table, query):
+    document = get_document(table)
+    tsquery = f"plainto_tsquery('{SEARCH_CONFIG}', %s)"
+    return queryset.extra(
+        select={'search_rank': f'ts_rank({document}, {tsquery})'},
+        select_params=(query,),
+        where=(f'{document} @@ {tsquery}',),
+        params=(query,)
+    )
+
+
+def search_sqlite(queryset, table, query):
+    words = re.findall(r'\w+', query)
+    if not words:
+        return queryset.none()
+    match = ' '.join(f'"{word}"' for word in words)
+    fts = f'{table}_fts'
+    return queryset.extra(
+        select={'search_rank': f'SELECT -bm25({fts}) FROM {fts} '
+                               f'WHERE {fts} MATCH %s '
+                               f'AND rowid = "{table}"."id"'},
+        select_params=(match,),
+        where=(f'"{table}"."id" IN '
+               f'(SELECT rowid FROM {fts} WHERE {fts} MATCH %s)',),
+        params=(match,)
+    )
+
+
+def search_fallback(queryset, table, query):
+    condition = Q()
+    for field in SEARCH_FIELDS[table]:
+        condition |= Q(**{f'{field}__icontains': query})
+    return queryset.filter(condition).extra(select={'search_rank': '0'})
+
+
+SEARCH_BACKENDS = {
+    'postgresql': search_postgresql,
+    'sqlite': search_sqlite,
+}
+
+
+def search(queryset, query):
+    table = queryset.model._meta.db_table
+    search_backend = SEARCH_BACKENDS.get(
+        connections[queryset.db].vendor, search_fallback)
+    return search_backend(queryset, table, query).order_by(
+        '-search_rank', '-id')
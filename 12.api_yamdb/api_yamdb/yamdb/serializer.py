@@ -1,7 +1,6 @@
 from rest_framework import serializers
 
 from .models import Category, Comment, Genre, Review, Title, User
-from django.db.models import Avg
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -29,6 +28,15 @@ class TitleWriteSerializer(serializers.ModelSerializer):
                   'description', 'genre', 'category')
         model = Title
 
+    def update(self, instance, validated_data):
+        genre = validated_data.pop('genre', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        if genre is not None:
+            instance.genre.set(genre)
+        return instance
+
 
 class TitleReadSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
@@ -42,7 +50,9 @@ class TitleReadSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
     def get_rating(self, title):
-        return title.reviews.aggregate(rating=Avg('score'))['rating']
+        if title.rating_count:
+            return title.rating
+        return None
 
 
 class CommentSerializer(serializers.ModelSerializer):
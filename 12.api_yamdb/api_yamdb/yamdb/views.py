@@ -1,4 +1,5 @@
 from django.core.mail import send_mail
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
@@ -15,9 +16,10 @@ from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
 
-from .filters import TitleFilter
+from .filters import FullTextSearchFilter, TitleFilter, TitleOrderingFilter
 from .models import Category, Genre, Review, Title, User
 from .permissions import IsAdminOrReadOnly, IsAutrhOrAdminOrModeratorOrReadOnly
+from .ratings import change_rating
 from .serializer import (CategorySerializer, CommentSerializer,
                          GenreSerializer, ReviewSerializer,
                          TitleReadSerializer, TitleWriteSerializer,
@@ -49,14 +51,17 @@ class GenreViewSet(viewsets.GenericViewSet,
 
 class TitleViewSet(viewsets.GenericViewSet, CreateAPIView, DestroyAPIView,
                    ListAPIView, RetrieveAPIView, UpdateAPIView):
-    queryset = Title.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, FullTextSearchFilter,
+                       TitleOrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('rating', 'year', 'name')
 
-    def get_object(self):
-        obj = get_object_or_404(Title, pk=self.kwargs.get('pk'))
-        return obj
+    def get_queryset(self):
+        if self.action in ('list', 'retrieve'):
+            return Title.objects.select_related(
+                'category').prefetch_related('genre')
+        return Title.objects.all()
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
@@ -66,18 +71,43 @@ class TitleViewSet(viewsets.GenericViewSet, CreateAPIView, DestroyAPIView,
 
 class ReviewViewSet(viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    filter_backends = (FullTextSearchFilter,)
     permission_classes = (
         IsAutrhOrAdminOrModeratorOrReadOnly, )
 
     def get_queryset(self):
         title = get_object_or_404(
             Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        reviews = title.reviews.select_related('author')
+        if self.action in ('update', 'partial_update', 'destroy'):
+            return reviews.select_for_update(of=('self',))
+        return reviews
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
 
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    @transaction.atomic
     def perform_create(self, serializer):
         title = get_object_or_404(
             Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user, title=title)
+        review = serializer.save(author=self.request.user, title=title)
+        change_rating(title.id, review.score, 1)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        review = serializer.save()
+        change_rating(review.title_id, review.score - old_score)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        change_rating(instance.title_id, -instance.score, -1)
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -89,7 +119,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         review = get_object_or_404(
             Review, id=self.kwargs['review_id'],
             title=self.kwargs['title_id'])
-        return review.comments.all()
+        return review.comments.select_related('author')
 
     def perform_create(self, serializer):
         review = get_object_or_404(
@@ -0,0 +1,185 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test07RatingAPI:
+
+    def get_title(self, title_id):
+        from yamdb.models import Title
+        return Title.objects.get(id=title_id)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_stored(self, user_client, admin):
+        reviews, titles, user, moderator = create_reviews(user_client, admin)
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что при создании отзыва обновляются поля '
+            '`rating_sum` и `rating_count` произведения'
+        )
+
+        client_user = auth_client(user)
+        client_user.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (18, 3), (
+            'Проверьте, что при изменении оценки отзыва обновляется '
+            'поле `rating_sum` произведения'
+        )
+
+        user_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (13, 2), (
+            'Проверьте, что при удалении отзыва обновляются поля '
+            '`rating_sum` и `rating_count` произведения'
+        )
+        response = user_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') == 6.5, (
+            'Проверьте, что `rating` произведения вычисляется по '
+            'сохранённым полям `rating_sum` и `rating_count`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recompute_ratings(self, user_client, admin):
+        from yamdb.models import Title
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0)
+        call_command('recompute_ratings')
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что команда `recompute_ratings` пересчитывает '
+            'рейтинг произведений по отзывам'
+        )
+        title = self.get_title(titles[1]['id'])
+        assert (title.rating_sum, title.rating_count) == (0, 0), (
+            'Проверьте, что команда `recompute_ratings` обнуляет рейтинг '
+            'произведений без отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rating_ordering_and_filter(self, user_client, admin):
+        _, titles, user, _ = create_reviews(user_client, admin)
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'asdf', 'score': 9}
+        )
+        response = user_client.get('/api/v1/titles/?ordering=-rating')
+        data = response.json()['results']
+        assert [title['id'] for title in data] == [
+            titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что при GET запросе `/api/v1/titles/?ordering=-rating` '
+            'произведения отсортированы по убыванию рейтинга'
+        )
+        response = user_client.get('/api/v1/titles/?rating_min=5')
+        data = response.json()['results']
+        assert [title['id'] for title in data] == [titles[1]['id']], (
+            'Проверьте, что при GET запросе `/api/v1/titles/?rating_min=5` '
+            'возвращаются только произведения с рейтингом не ниже 5'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_review_locked_on_change(self, user_client, admin):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        reviews, titles, user, _ = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            auth_client(user).patch(url, data={'score': 1})
+        if connection.features.has_select_for_update:
+            assert any('FOR UPDATE' in query['sql']
+                       and 'yamdb_review' in query['sql'].split('FROM')[1]
+                       for query in context.captured_queries), (
+                'Проверьте, что при изменении отзыва строка отзыва '
+                'блокируется до пересчёта рейтинга'
+            )
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (10, 3)
+        auth_client(user).delete(url)
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (9, 2)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_unrated_titles(self, user_client, admin):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        response = user_client.get('/api/v1/titles/?rating_min=0')
+        data = response.json()['results']
+        assert [title['id'] for title in data] == [titles[0]['id']], (
+            'Проверьте, что фильтр `rating_min` не возвращает произведения '
+            'без отзывов'
+        )
+        response = user_client.get('/api/v1/titles/?ordering=rating')
+        data = response.json()['results']
+        assert [title['id'] for title in data] == [
+            titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что при сортировке по возрастанию рейтинга '
+            'произведения без отзывов идут после оценённых'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_rating_kept_on_edit(self, user_client, admin, rf):
+        from types import SimpleNamespace
+
+        from django.contrib import admin as admin_site
+
+        from yamdb.models import Review, Title
+        from yamdb.serializer import TitleWriteSerializer
+
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        title = self.get_title(titles[0]['id'])
+        Title.objects.filter(id=title.id).update(rating_sum=20)
+        serializer = TitleWriteSerializer(title, data={'name': 'Новое'},
+                                          partial=True)
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        title = self.get_title(titles[0]['id'])
+        assert (title.name, title.rating_sum) == ('Новое', 20), (
+            'Проверьте, что при изменении произведения не перезаписываются '
+            'поля `rating_sum` и `rating_count`'
+        )
+        Title.objects.filter(id=title.id).update(rating_sum=12)
+
+        review_admin = admin_site.site._registry[Review]
+        request = rf.post('/admin/')
+        review = Review.objects.get(id=reviews[0]['id'])
+        review.score = 10
+        review_admin.save_model(
+            request, review, SimpleNamespace(changed_data=['score']), True)
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (17, 3), (
+            'Проверьте, что при изменении оценки отзыва в админке '
+            'обновляется рейтинг произведения'
+        )
+        review_admin.delete_queryset(
+            request, Review.objects.filter(id__in=[reviews[0]['id'],
+                                                   reviews[1]['id']]))
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (4, 1), (
+            'Проверьте, что при удалении отзывов в админке обновляется '
+            'рейтинг произведения'
+        )
+        assert set(admin_site.site._registry[Title].readonly_fields) == {
+            'rating_sum', 'rating_count', 'rating'}, (
+            'Проверьте, что поля рейтинга нельзя изменить в админке'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_benchmark(self, user_client, admin):
+        from io import StringIO
+
+        from yamdb.models import Review, Title
+
+        create_reviews(user_client, admin)
+        counts = (Title.objects.count(), Review.objects.count())
+        out = StringIO()
+        call_command('benchmark_title_rating', titles=20, reviews=100,
+                     repeat=1, stdout=out)
+        assert 'rating_min=9' in out.getvalue()
+        assert (Title.objects.count(), Review.objects.count()) == counts, (
+            'Проверьте, что команда `benchmark_title_rating` откатывает '
+            'добавленные произведения и отзывы'
+        )
@@ -0,0 +1,55 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test08QueriesAPI:
+
+    def create_more_titles(self, user_client, count):
+        for index in range(count):
+            user_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {index}', 'year': 2000 + index,
+                'genre': ['horror', 'comedy'], 'category': 'films'
+            })
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_queries(self, client, user_client,
+                               django_assert_num_queries):
+        titles, _, _ = create_titles(user_client)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        self.create_more_titles(user_client, 5)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == 7, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` количество '
+            'запросов к базе не зависит от количества произведений'
+        )
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['category']['slug'] == 'films', (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` '
+            'категория и жанры загружаются вместе с произведением'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_and_comments_queries(self, client, user_client, admin,
+                                             django_assert_num_queries):
+        _, reviews, titles, _, _ = create_comments(user_client, admin)
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert len(response.json()['results']) == 3, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/` '
+            'авторы отзывов загружаются одним запросом'
+        )
+        with django_assert_num_queries(3):
+            response = client.get(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                f'{reviews[0]["id"]}/comments/'
+            )
+        assert len(response.json()['results']) == 3, (
+            'Проверьте, что при GET запросе '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'авторы комментариев загружаются одним запросом'
+        )
@@ -0,0 +1,101 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test09SearchAPI:
+
+    def search_titles(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?search=` '
+            'возвращается статус 200'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_search(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        assert self.search_titles(client, 'поворот') == [titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по названию '
+            'произведения без учёта регистра'
+        )
+        assert self.search_titles(client, 'драма года') == [
+            titles[1]['id']], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по описанию '
+            'произведения'
+        )
+        assert self.search_titles(client, 'пике драма') == [], (
+            'Проверьте, что `/api/v1/titles/?search=` возвращает только '
+            'произведения, содержащие все слова запроса'
+        )
+        user_client.patch(f'/api/v1/titles/{titles[0]["id"]}/',
+                          data={'name': 'Разворот'})
+        assert self.search_titles(client, 'разворот') == [titles[0]['id']], (
+            'Проверьте, что поиск учитывает изменения названия произведения'
+        )
+        user_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert self.search_titles(client, 'разворот') == [], (
+            'Проверьте, что удалённые произведения не попадают в поиск'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_search_rank(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        user_client.patch(f'/api/v1/titles/{titles[0]["id"]}/',
+                          data={'description': 'Проект года'})
+        user_client.patch(f'/api/v1/titles/{titles[1]["id"]}/',
+                          data={'description': 'Проект проекта'})
+        assert self.search_titles(client, 'проект') == [
+            titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что результаты `/api/v1/titles/?search=` '
+            'отсортированы по релевантности'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_search(self, client, user_client, admin):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                              {'search': 'qwerty123'})
+        assert [review['id'] for review in response.json()['results']] == [
+            reviews[1]['id']], (
+            'Проверьте, что `/api/v1/titles/{title_id}/reviews/?search=` '
+            'ищет по тексту отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark(self, user_client):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from yamdb.models import Review, Title
+
+        create_titles(user_client)
+        counts = (Title.objects.count(), Review.objects.count())
+        out = StringIO()
+        call_command('benchmark_title_search', titles=20, reviews=100,
+                     repeat=1, stdout=out)
+        assert 'редкое слово' in out.getvalue()
+        assert (Title.objects.count(), Review.objects.count()) == counts, (
+            'Проверьте, что команда `benchmark_title_search` откатывает '
+            'добавленные произведения и отзывы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_fts_update_trigger_columns(self):
+        from django.db import connection
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('Триггеры FTS5 используются только в SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE '%_fts_au'")
+            triggers = dict(cursor.fetchall())
+        assert 'AFTER UPDATE OF name, description ON' in triggers[
+            'yamdb_title_fts_au'], (
+            'Проверьте, что индекс FTS5 произведения обновляется только при '
+            'изменении названия или описания, а не рейтинга'
+        )
+        assert 'AFTER UPDATE OF text ON' in triggers['yamdb_review_fts_au']
@@ -0,0 +1,46 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test10ImportCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_csv(self, client):
+        from yamdb.models import Comment, Review, Title
+        call_command('import_csv')
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `import_csv` загружает все произведения'
+        )
+        assert Title.genre.through.objects.count() == 42, (
+            'Проверьте, что команда `import_csv` загружает связи '
+            'произведений и жанров'
+        )
+        review = Review.objects.get(id=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `import_csv` сохраняет дату '
+            'публикации отзыва из файла'
+        )
+        assert Review.objects.filter(title_id=23).count() == 5, (
+            'Проверьте, что команда `import_csv` пропускает повторные '
+            'отзывы автора на одно произведение'
+        )
+        assert Comment.objects.count() == 5
+        title = Title.objects.get(id=review.title_id)
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после загрузки пересчитывается рейтинг '
+            'произведений'
+        )
+        response = client.get('/api/v1/titles/', {'search': 'шоушенка'})
+        assert [title['id'] for title in response.json()['results']] == [1], (
+            'Проверьте, что загруженные произведения доступны в поиске'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_import_csv_twice(self):
+        from yamdb.models import Review
+        call_command('import_csv')
+        call_command('import_csv')
+        assert Review.objects.count() == 73, (
+            'Проверьте, что повторный запуск `import_csv` не создаёт '
+            'дубликатов'
+        )
@@ -27,7 +27,7 @@ INSTALLED_APPS = [
     'rest_framework.authtoken',
     'django_filters',
     'djoser',
-    'recipes',
+    'recipes.apps.ReceiptsConfig',
     'users',
     'sorl.thumbnail',
     'drf_pdf',
@@ -62,6 +62,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'foodgram.wsgi.application'
+ASGI_APPLICATION = 'foodgram.asgi.application'
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', default=8))
 
 DATABASES = {
     'default': {
@@ -75,6 +77,30 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND',
+                             default=('django.core.cache.backends.db.'
+                                      'DatabaseCache')),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='foodgram_cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Rendered shopping-list PDFs are large and numerous, so they are culled
+    # in their own table and cannot evict the catalogue version stamps.
+    'shopping_lists': {
+        'BACKEND': os.getenv('CACHE_BACKEND',
+                             default=('django.core.cache.backends.db.'
+                                      'DatabaseCache')),
+        'LOCATION': os.getenv('SHOPPING_LIST_CACHE_LOCATION',
+                              default='foodgram_shopping_list_cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME':
@@ -112,6 +138,8 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 AUTH_USER_MODEL = 'users.User'
 
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
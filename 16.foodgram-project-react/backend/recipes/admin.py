@@ -1,25 +1,102 @@
 from django.contrib import admin
 
+from .images import schedule_renditions
 from .models import Ingredient, IngredientInRecipe, Recipe, Tag
+from .recipe_index import record_changes
+from .shopping_list import track_recipe_amounts
 
 
 class IngredientClass(admin.ModelAdmin):
     list_display = ('name', 'measurement_unit')
-    list_filter = ('name',)
+    list_filter = ('measurement_unit',)
+    search_fields = ('name',)
+    show_full_result_count = False
+
+
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'hex_code')
+    search_fields = ('name', 'slug')
+
+
+class IngredientInRecipeInline(admin.TabularInline):
+    model = IngredientInRecipe
+    autocomplete_fields = ('ingredient',)
+    extra = 1
 
 
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ('name', 'author', 'in_favourite')
-    list_filter = ('author', 'name', 'tags')
+    list_filter = ('tags',)
+    list_select_related = ('author',)
+    search_fields = ('name', 'author__username')
+    autocomplete_fields = ('author', 'tags')
+    readonly_fields = ('favorites_count', 'renditions_ready')
+    inlines = (IngredientInRecipeInline,)
+    show_full_result_count = False
 
     def in_favourite(self, obj):
-        return obj.fav_recipes.count()
+        return obj.favorites_count
 
     in_favourite.short_description = ('Количество добавлений '
                                       'рецепта в "Избранное"')
+    in_favourite.admin_order_field = 'favorites_count'
+
+    def save_model(self, request, obj, form, change):
+        image_changed = 'image' in form.changed_data
+        if image_changed:
+            obj.renditions_ready = False
+        if change:
+            update_fields = [field.name for field in obj._meta.concrete_fields
+                             if field.name in form.changed_data]
+            if image_changed:
+                update_fields.append('renditions_ready')
+            obj.save(update_fields=update_fields)
+        else:
+            super().save_model(request, obj, form, change)
+        if image_changed:
+            schedule_renditions(obj)
+
+    def save_related(self, request, form, formsets, change):
+        recipe = form.instance
+        before = set(recipe.ings_in_recipe.values_list('ingredient_id',
+                                                       flat=True))
+        with track_recipe_amounts((recipe.pk,)):
+            super().save_related(request, form, formsets, change)
+        after = set(recipe.ings_in_recipe.values_list('ingredient_id',
+                                                      flat=True))
+        record_changes((recipe.pk, ingredient_id)
+                       for ingredient_id in before ^ after)
+
+
+class IngredientInRecipeAdmin(admin.ModelAdmin):
+    list_display = ('recipe', 'ingredient', 'amount')
+    list_select_related = ('recipe', 'ingredient')
+    autocomplete_fields = ('recipe', 'ingredient')
+    search_fields = ('recipe__name', 'ingredient__name')
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        pairs = [(obj.recipe_id, obj.ingredient_id)]
+        if change:
+            pairs.extend(IngredientInRecipe.objects.filter(
+                pk=obj.pk).values_list('recipe_id', 'ingredient_id'))
+        with track_recipe_amounts(recipe_id for recipe_id, _ in pairs):
+            super().save_model(request, obj, form, change)
+        record_changes(pairs)
+
+    def delete_model(self, request, obj):
+        with track_recipe_amounts((obj.recipe_id,)):
+            super().delete_model(request, obj)
+        record_changes(((obj.recipe_id, obj.ingredient_id),))
+
+    def delete_queryset(self, request, queryset):
+        pairs = list(queryset.values_list('recipe_id', 'ingredient_id'))
+        with track_recipe_amounts(recipe_id for recipe_id, _ in pairs):
+            super().delete_queryset(request, queryset)
+        record_changes(pairs)
 
 
 admin.site.register(Ingredient, IngredientClass)
 admin.site.register(Recipe, RecipeAdmin)
-admin.site.register(Tag)
-admin.site.register(IngredientInRecipe)
+admin.site.register(Tag, TagAdmin)
+admin.site.register(IngredientInRecipe, IngredientInRecipeAdmin)
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ReceiptsConfig(AppConfig):
     name = 'recipes'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .shopping_list import register_fonts
+        register_fonts()
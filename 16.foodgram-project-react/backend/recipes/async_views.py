@@ -0,0 +1,52 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+
+from .views import (DownloadShoppingList, IngredientViewSet, RecipeViewSet,
+                    TagViewSet)
+
+executor = ThreadPoolExecutor(max_workers=settings.ASGI_THREADS,
+                              thread_name_prefix='foodgram-views')
+
+
+def run_view(view, request, *args, **kwargs):
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        if response.streaming:
+            # Django 3.2 iterates streaming responses inside the event loop,
+            # where the ORM is not allowed, so the chunks are produced here.
+            response.streaming_content = list(response.streaming_content)
+        return response
+    finally:
+        close_old_connections()
+
+
+def pooled(view):
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            # Under WSGI the view keeps running in the request thread.
+            return await sync_to_async(view)(request, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(run_view, view, request, *args, **kwargs)
+        )
+
+    return async_view
+
+
+recipe_list = pooled(RecipeViewSet.as_view(
+    {'get': 'list', 'post': 'create'}, basename='recipes', detail=False))
+tag_list = pooled(TagViewSet.as_view(
+    {'get': 'list'}, basename='tags', detail=False))
+ingredient_list = pooled(IngredientViewSet.as_view(
+    {'get': 'list'}, basename='ingredients', detail=False))
+download_shopping_list = pooled(DownloadShoppingList.as_view())
@@ -0,0 +1,73 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+MAX_AGE = 60
+CATALOGUE_TIMEOUT = 60 * 60
+VERSION_CHECK_INTERVAL = 5
+
+_versions = {}
+_catalogues = {}
+
+
+def get_version(name, fresh=False):
+    version, checked = _versions.get(name, (None, None))
+    now = time.monotonic()
+    if (fresh or version is None
+            or now - checked >= VERSION_CHECK_INTERVAL):
+        version = cache.get_or_set(f'catalogue_version:{name}',
+                                   time.time_ns, None)
+        _versions[name] = (version, now)
+    return version
+
+
+def bump_version(name):
+    version = time.time_ns()
+    cache.set(f'catalogue_version:{name}', version, None)
+    _versions[name] = (version, time.monotonic())
+    return version
+
+
+def forget_versions():
+    _versions.clear()
+    _catalogues.clear()
+
+
+def get_catalogue(name, get_data):
+    version = get_version(name)
+    local = _catalogues.get(name)
+    if local is not None and local[0] == version:
+        return local[1]
+    key = f'catalogue:{name}:{version}'
+    catalogue = cache.get(key)
+    if catalogue is None:
+        content = JSONRenderer().render(get_data())
+        etag = f'"{hashlib.sha256(content).hexdigest()}"'
+        catalogue = (content, etag)
+        cache.set(key, catalogue, CATALOGUE_TIMEOUT)
+    _catalogues[name] = (version, catalogue)
+    return catalogue
+
+
+class CatalogueMixin:
+    catalogue_name = None
+
+    def list(self, request, *args, **kwargs):
+        content, etag = get_catalogue(
+            self.catalogue_name,
+            lambda: self.get_serializer(self.get_queryset(), many=True).data
+        )
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH',
+                                                     ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=MAX_AGE)
+        return response
@@ -1,9 +1,33 @@
 import django_filters
+from django import forms
+from django.db.models import Exists, OuterRef
+from django_filters.widgets import QueryArrayWidget
+from rest_framework.filters import OrderingFilter
 
 from .models import Ingredient, Recipe
 from users.models import User
 
 
+class MultipleValueField(forms.Field):
+    widget = QueryArrayWidget
+
+    def to_python(self, value):
+        return list(value) if value else []
+
+
+class MultipleValueFilter(django_filters.Filter):
+    field_class = MultipleValueField
+
+
+class RecipeOrderingFilter(OrderingFilter):
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        fields = {field.lstrip('-') for field in ordering}
+        return (*ordering, *(field for field in view.ordering
+                             if field.lstrip('-') not in fields))
+
+
 class IngredientFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(field_name='name',
                                      lookup_expr='istartswith')
@@ -15,7 +39,7 @@ class IngredientFilter(django_filters.FilterSet):
 
 class RecipeFilter(django_filters.FilterSet):
     author = django_filters.ModelChoiceFilter(queryset=User.objects.all())
-    tags = django_filters.AllValuesMultipleFilter(field_name='tags__slug')
+    tags = MultipleValueFilter(method='get_tags')
     is_favorited = django_filters.BooleanFilter(method='get_is_favorited')
     is_in_shopping_cart = django_filters.BooleanFilter(
         method='get_is_in_shopping_cart')
@@ -24,12 +48,20 @@ class RecipeFilter(django_filters.FilterSet):
         model = Recipe
         fields = ('author', 'tags', 'is_favorited', 'is_in_shopping_cart')
 
+    def get_tags(self, queryset, name, value):
+        return queryset.annotate(has_tags=Exists(
+            Recipe.tags.through.objects.filter(recipe=OuterRef('pk'),
+                                               tag__slug__in=value)
+        )).filter(has_tags=True)
+
     def get_is_favorited(self, queryset, name, value):
         if self.request.user.is_authenticated and value:
-            return queryset.filter(fav_recipes__author=self.request.user)
+            return queryset.with_user_flags(self.request.user).filter(
+                is_favorited=True)
         return queryset
 
     def get_is_in_shopping_cart(self, queryset, name, value):
         if self.request.user.is_authenticated and value:
-            return queryset.filter(shop_recipes__author=self.request.user)
+            return queryset.with_user_flags(self.request.user).filter(
+                is_in_shopping_cart=True)
         return queryset
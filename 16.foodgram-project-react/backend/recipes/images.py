@@ -0,0 +1,183 @@
+import base64
+import binascii
+import io
+import logging
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from drf_extra_fields.fields import Base64ImageField
+from PIL import Image, ImageOps
+
+from .models import Recipe
+
+MAX_SIZE = (1920, 1920)
+EXIF_ORIENTATION = 0x0112
+RENDITIONS = {
+    'detail': (1200, 1200),
+    'card': (600, 600),
+    'thumbnail': (240, 240),
+}
+FORMAT = 'JPEG'
+EXTENSION = 'jpg'
+QUALITY = 85
+DECODE_CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+WORKERS = 2
+
+logger = logging.getLogger(__name__)
+executor = ThreadPoolExecutor(max_workers=WORKERS,
+                              thread_name_prefix='recipe-images')
+pending = set()
+
+
+def decode_base64(data, file):
+    for start in range(0, len(data), DECODE_CHUNK_SIZE):
+        file.write(base64.b64decode(data[start:start + DECODE_CHUNK_SIZE]))
+    file.seek(0)
+
+
+def encode(image):
+    buffer = io.BytesIO()
+    image.save(buffer, FORMAT, quality=QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def to_rgb(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def load_image(file):
+    image = Image.open(file)
+    normalized = (image.format == FORMAT
+                  and image.width <= MAX_SIZE[0]
+                  and image.height <= MAX_SIZE[1]
+                  and image.getexif().get(EXIF_ORIENTATION, 1) == 1)
+    image.draft('RGB', MAX_SIZE)
+    image = to_rgb(image)
+    image.thumbnail(MAX_SIZE)
+    return image, normalized
+
+
+def check_image(file):
+    image = Image.open(file)
+    if image.format is None or image.format.lower() not in (
+            RecipeImageField.ALLOWED_TYPES):
+        raise ValueError(image.format)
+    extension = image.format.lower()
+    image.draft('RGB', RENDITIONS['thumbnail'])
+    image.load()
+    file.seek(0)
+    return File(file, name=f'{uuid.uuid4()}.{extension}')
+
+
+def get_rendition_name(name, rendition):
+    root, _ = os.path.splitext(name)
+    return f'{root}_{rendition}.{EXTENSION}'
+
+
+def delete_files(names):
+    for name in names:
+        if default_storage.exists(name):
+            default_storage.delete(name)
+
+
+def save_renditions(recipe_id, name):
+    saved = []
+    try:
+        with default_storage.open(name) as file:
+            image, normalized = load_image(file)
+        if not Recipe.objects.filter(pk=recipe_id, image=name).exists():
+            return False
+        if not normalized:
+            image_field = Recipe._meta.get_field('image')
+            new_name = default_storage.save(
+                image_field.generate_filename(None,
+                                              f'{uuid.uuid4()}.{EXTENSION}'),
+                ContentFile(encode(image))
+            )
+            if not Recipe.objects.filter(pk=recipe_id, image=name).update(
+                    image=new_name):
+                default_storage.delete(new_name)
+                return False
+            default_storage.delete(name)
+            name = new_name
+        for rendition, size in RENDITIONS.items():
+            resized = image.copy()
+            resized.thumbnail(size)
+            rendition_name = get_rendition_name(name, rendition)
+            if default_storage.exists(rendition_name):
+                default_storage.delete(rendition_name)
+            saved.append(default_storage.save(rendition_name,
+                                              ContentFile(encode(resized))))
+    except Exception:
+        logger.exception('Не удалось подготовить копии изображения %s', name)
+        delete_files(saved)
+        return False
+    if not Recipe.objects.filter(pk=recipe_id, image=name).update(
+            renditions_ready=True):
+        delete_files(saved)
+        return False
+    return True
+
+
+def save_renditions_in_thread(recipe_id, name):
+    try:
+        save_renditions(recipe_id, name)
+    finally:
+        connection.close()
+
+
+def submit_renditions(recipe_id, name):
+    future = executor.submit(save_renditions_in_thread, recipe_id, name)
+    pending.add(future)
+    future.add_done_callback(pending.discard)
+
+
+def wait_for_renditions(timeout=None):
+    return wait(list(pending), timeout)
+
+
+def schedule_renditions(recipe):
+    recipe_id, name = recipe.pk, recipe.image.name
+    transaction.on_commit(lambda: submit_renditions(recipe_id, name))
+
+
+def get_rendition_urls(recipe, request=None):
+    urls = {}
+    for rendition in RENDITIONS:
+        url = (default_storage.url(get_rendition_name(recipe.image.name,
+                                                      rendition))
+               if recipe.renditions_ready else recipe.image.url)
+        urls[rendition] = (request.build_absolute_uri(url)
+                           if request is not None else url)
+    return urls
+
+
+class RecipeImageField(Base64ImageField):
+
+    def to_internal_value(self, base64_data):
+        if base64_data in self.EMPTY_VALUES:
+            return None
+        if not isinstance(base64_data, str):
+            return super().to_internal_value(base64_data)
+        base64_data = base64_data.rpartition(';base64,')[2]
+        file = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        try:
+            decode_base64(base64_data, file)
+            return check_image(file)
+        except (binascii.Error, ValueError, OSError,
+                Image.DecompressionBombError):
+            file.close()
+            raise ValidationError(self.INVALID_FILE_MESSAGE)
@@ -0,0 +1,61 @@
+import bisect
+import threading
+
+from .catalogue import bump_version, get_version
+from .models import Ingredient
+
+AUTOCOMPLETE_LIMIT = 20
+VERSION_NAME = 'ingredients'
+
+
+class IngredientPrefixIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._version = None
+        self._keys = None
+        self._rows = None
+
+    def _load(self):
+        version = get_version(VERSION_NAME)
+        with self._lock:
+            if self._keys is not None and self._version == version:
+                return self._keys, self._rows
+            self._generation += 1
+            self._keys = self._rows = None
+            generation = self._generation
+        ingredients = sorted(
+            (name.casefold(), name, measurement_unit, pk)
+            for pk, name, measurement_unit in Ingredient.objects.values_list(
+                'id', 'name', 'measurement_unit')
+        )
+        keys = [ingredient[0] for ingredient in ingredients]
+        rows = [{'id': pk, 'name': name, 'measurement_unit': unit}
+                for _, name, unit, pk in ingredients]
+        with self._lock:
+            if self._generation == generation:
+                self._keys, self._rows = keys, rows
+                self._version = version
+        return keys, rows
+
+    def search(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        keys, rows = self._load()
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(keys, prefix)
+        result = []
+        for key, row in zip(keys[start:start + limit],
+                            rows[start:start + limit]):
+            if not key.startswith(prefix):
+                break
+            result.append(row)
+        return result
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._keys = self._rows = None
+            bump_version(VERSION_NAME)
+
+
+ingredient_index = IngredientPrefixIndex()
@@ -0,0 +1,106 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Recipe, Tag
+
+User = get_user_model()
+
+BATCH_SIZE = 10000
+AUTHORS = 1000
+TAGGED_SHARE = 10
+CHANGELIST_URL = '/admin/recipes/recipe/'
+
+
+class Command(BaseCommand):
+    help = ('Измеряет время открытия списка рецептов в админке (без '
+            'фильтров, с фильтром по тегу, с поиском и с сортировкой) '
+            'на временных рецептах, которые затем откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=1000000,
+                            help='Сколько временных рецептов добавить '
+                                 '(откатываются после замера)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Количество замеров на каждой странице')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--host', default='localhost')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            tag = self.fill_recipes(options['recipes'], options['seed'])
+            admin_user = User.objects.create(
+                username='benchmark_admin', email='admin@foodgram.local',
+                is_staff=True, is_superuser=True)
+            client = Client(HTTP_HOST=options['host'])
+            client.force_login(admin_user)
+            self.stdout.write(f'Рецептов: {Recipe.objects.count()}')
+            for label, query in (
+                    ('без фильтров', ''),
+                    ('фильтр по тегу', f'?tags__id__exact={tag.pk}'),
+                    ('поиск', '?q=benchmark+4242'),
+                    ('сортировка по "Избранному"', '?o=-3')):
+                self.report(client, label, CHANGELIST_URL + query,
+                            options['repeat'])
+            transaction.set_rollback(True)
+
+    def fill_recipes(self, count, seed):
+        generator = random.Random(seed)
+        tag = Tag.objects.create(name='benchmark', hex_code='#000002',
+                                 slug='benchmark-admin')
+        User.objects.bulk_create(
+            User(username=f'benchmark_admin_{index}',
+                 email=f'benchmark_admin_{index}@foodgram.local')
+            for index in range(AUTHORS)
+        )
+        author_ids = list(User.objects.filter(
+            username__startswith='benchmark_admin_'
+        ).values_list('pk', flat=True))
+        for start in range(0, count, BATCH_SIZE):
+            Recipe.objects.bulk_create(
+                Recipe(author_id=generator.choice(author_ids),
+                       name=f'benchmark {index}', text='benchmark',
+                       image='recipes/benchmark.jpg', cooking_time=5,
+                       favorites_count=generator.randint(0, 50))
+                for index in range(start, min(start + BATCH_SIZE, count))
+            )
+        recipe_ids = Recipe.objects.filter(
+            author_id__in=author_ids
+        ).values_list('pk', flat=True).order_by('pk')
+        batch = []
+        for index, recipe_id in enumerate(recipe_ids.iterator()):
+            if index % TAGGED_SHARE:
+                continue
+            batch.append(Recipe.tags.through(recipe_id=recipe_id,
+                                             tag_id=tag.pk))
+            if len(batch) == BATCH_SIZE:
+                Recipe.tags.through.objects.bulk_create(batch)
+                batch = []
+        Recipe.tags.through.objects.bulk_create(batch)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in (Recipe, Recipe.tags.through, User):
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+        return tag
+
+    def report(self, client, label, url, repeat):
+        latencies = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise CommandError(f'{url}: код ответа '
+                                   f'{response.status_code}')
+        self.stdout.write(
+            f'  {label}: медиана '
+            f'{statistics.median(latencies) * 1000:.1f} мс, '
+            f'максимум {max(latencies) * 1000:.1f} мс, '
+            f'запросов {len(context.captured_queries)}')
@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.ingredient_index import AUTOCOMPLETE_LIMIT, ingredient_index
+from recipes.models import Ingredient
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает задержку поиска ингредиентов по префиксу через '
+            'индекс в памяти и через запрос к базе')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ingredients', type=int, default=0,
+                            help='Сколько временных ингредиентов добавить '
+                                 'перед замером (откатываются после него)')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Количество поисковых запросов')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            Ingredient.objects.bulk_create(
+                Ingredient(name=f'ингредиент {index:07}',
+                           measurement_unit='г')
+                for index in range(options['ingredients'])
+            )
+            ingredient_index.invalidate()
+            names = list(Ingredient.objects.values_list('name', flat=True))
+            if not names:
+                self.stdout.write('В базе нет ингредиентов')
+                return
+            generator = random.Random(options['seed'])
+            prefixes = []
+            for _ in range(options['requests']):
+                name = generator.choice(names)
+                prefixes.append(name[:generator.randint(1, 4)])
+            ingredient_index.search('')
+            self.report('Индекс в памяти', [
+                self.measure(lambda: ingredient_index.search(prefix))
+                for prefix in prefixes
+            ])
+            self.report('Запрос к базе', [
+                self.measure(lambda: list(Ingredient.objects.filter(
+                    name__istartswith=prefix
+                ).order_by('name').values(
+                    'id', 'name', 'measurement_unit'
+                )[:AUTOCOMPLETE_LIMIT]))
+                for prefix in prefixes
+            ])
+            transaction.set_rollback(True)
+        ingredient_index.invalidate()
+
+    def measure(self, search):
+        started = time.perf_counter()
+        search()
+        return time.perf_counter() - started
+
+    def report(self, label, latencies):
+        latencies = sorted(latencies)
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        self.stdout.write(f'{label}: медиана {p50 * 1000:.3f} мс, '
+                          f'99% {p99 * 1000:.3f} мс')
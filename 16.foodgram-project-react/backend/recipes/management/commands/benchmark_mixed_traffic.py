@@ -0,0 +1,162 @@
+import base64
+import io
+import json
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+from rest_framework.authtoken.models import Token
+
+from recipes.images import (RENDITIONS, get_rendition_name,
+                            wait_for_renditions)
+from recipes.models import Ingredient, Recipe, Tag
+
+User = get_user_model()
+
+TRAFFIC = (('catalogue', 6), ('download', 2), ('create', 2))
+CATALOGUE_PATHS = ('/api/tags/', '/api/ingredients/')
+DOWNLOAD_PATH = '/api/recipes/download_shopping_cart/'
+IMAGE_SIZE = (1600, 1200)
+
+
+class Command(BaseCommand):
+    help = ('Отправляет на запущенные серверы одинаковую смешанную '
+            'нагрузку: чтение тегов и ингредиентов, выгрузку списка '
+            'покупок в PDF и создание рецептов с изображением, и сравнивает '
+            'их пропускную способность. Передайте адреса сервера в режиме '
+            'WSGI и в режиме ASGI')
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*',
+                            default=['http://localhost:8000'],
+                            help='Адреса серверов, использующих одну БД')
+        parser.add_argument('--requests', type=int, default=300,
+                            help='Количество запросов к каждому серверу')
+        parser.add_argument('--concurrency', type=int, default=16,
+                            help='Количество одновременных запросов')
+        parser.add_argument('--cart', type=int, default=20,
+                            help='Сколько рецептов положить в корзину '
+                                 'для выгрузки списка покупок')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        urls = [url.rstrip('/') for url in options['urls']]
+        tag = Tag.objects.first()
+        ingredient_ids = list(Ingredient.objects.values_list('pk', flat=True)
+                              .order_by('pk')[:10])
+        if tag is None or not ingredient_ids:
+            raise CommandError('В базе должны быть теги и ингредиенты')
+        user = User.objects.create(username='benchmark_traffic',
+                                   email='benchmark_traffic@foodgram.local')
+        try:
+            self.token = Token.objects.create(user=user).key
+            self.url = urls[0]
+            self.fill_cart(options['cart'])
+            self.recipe = json.dumps({
+                'ingredients': [{'id': ingredient_id, 'amount': 10}
+                                for ingredient_id in ingredient_ids],
+                'tags': [tag.pk],
+                'image': self.get_image(),
+                'name': 'benchmark', 'text': 'benchmark', 'cooking_time': 5,
+            }).encode()
+            generator = random.Random(options['seed'])
+            kinds = generator.choices(
+                [kind for kind, _ in TRAFFIC],
+                weights=[weight for _, weight in TRAFFIC],
+                k=options['requests'])
+            throughputs = []
+            for url in urls:
+                self.url = url
+                started = time.perf_counter()
+                with ThreadPoolExecutor(options['concurrency']) as executor:
+                    results = list(executor.map(self.send, kinds))
+                throughputs.append(self.report(
+                    time.perf_counter() - started, results,
+                    options['concurrency']))
+            for url, throughput in zip(urls[1:], throughputs[1:]):
+                self.stdout.write(
+                    f'{url}: {throughput / throughputs[0]:.2f} × '
+                    f'пропускная способность {urls[0]}')
+        finally:
+            # Копии изображений, которые готовит этот же процесс (например,
+            # live_server в тестах), дописываются до удаления рецептов.
+            wait_for_renditions()
+            self.clean_up(user)
+
+    def fill_cart(self, count):
+        recipe_ids = list(Recipe.objects.values_list('pk', flat=True)[:count])
+        if recipe_ids:
+            self.request('POST', '/api/recipes/shopping_cart/',
+                         json.dumps({'recipes': recipe_ids}).encode())
+
+    def get_image(self):
+        buffer = io.BytesIO()
+        Image.effect_noise(IMAGE_SIZE, 32).convert('RGB').save(buffer, 'JPEG')
+        return ('data:image/jpeg;base64,'
+                + base64.b64encode(buffer.getvalue()).decode())
+
+    def request(self, method, path, body=None):
+        request = urllib.request.Request(
+            self.url + path, data=body, method=method,
+            headers={'Authorization': f'Token {self.token}',
+                     'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+    def send(self, kind):
+        started = time.perf_counter()
+        if kind == 'catalogue':
+            status = self.request('GET', random.choice(CATALOGUE_PATHS))
+        elif kind == 'download':
+            status = self.request('GET', DOWNLOAD_PATH)
+        else:
+            status = self.request('POST', '/api/recipes/', self.recipe)
+        return kind, status, time.perf_counter() - started
+
+    def report(self, elapsed, results, concurrency):
+        throughput = len(results) / elapsed
+        self.stdout.write(
+            f'{self.url}, одновременных запросов: {concurrency}: '
+            f'{throughput:.1f} запросов/с')
+        latencies = defaultdict(list)
+        errors = []
+        for kind, status, latency in results:
+            latencies[kind].append(latency)
+            if status >= 400:
+                errors.append(status)
+        for kind, _ in TRAFFIC:
+            kind_latencies = sorted(latencies[kind])
+            if not kind_latencies:
+                continue
+            p95 = kind_latencies[max(int(len(kind_latencies) * 0.95) - 1, 0)]
+            self.stdout.write(
+                f'  {kind}: {len(kind_latencies)} запросов, медиана '
+                f'{statistics.median(kind_latencies) * 1000:.1f} мс, '
+                f'95% {p95 * 1000:.1f} мс')
+        if errors:
+            self.stdout.write(self.style.WARNING(
+                f'Ответов с ошибкой: {len(errors)} (коды: '
+                f'{", ".join(map(str, sorted(set(errors))))})'))
+        return throughput
+
+    def clean_up(self, user):
+        names = list(Recipe.objects.filter(author=user).exclude(
+            image='').values_list('image', flat=True))
+        user.delete()
+        for name in names:
+            for file_name in (name, *(get_rendition_name(name, rendition)
+                                      for rendition in RENDITIONS)):
+                if default_storage.exists(file_name):
+                    default_storage.delete(file_name)
@@ -0,0 +1,152 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient, IngredientInRecipe, Recipe
+from recipes.recipe_index import IngredientRecipeIndex, record_recipe_changes
+
+User = get_user_model()
+
+BATCH_SIZE = 10000
+QUERY_SIZE = 5
+
+
+class Command(BaseCommand):
+    help = ('Измеряет задержку поиска рецептов по имеющимся ингредиентам '
+            '(индекс в памяти и адрес /api/recipes/match/) и применения '
+            'изменений рецептов к индексу на временных данных, которые '
+            'затем откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=1000000,
+                            help='Сколько временных рецептов добавить')
+        parser.add_argument('--ingredients', type=int, default=2000,
+                            help='Сколько временных ингредиентов добавить')
+        parser.add_argument('--per-recipe', type=int, default=8,
+                            help='Количество ингредиентов в рецепте')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Количество поисковых запросов')
+        parser.add_argument('--changes', type=int, default=100,
+                            help='Сколько рецептов изменить перед замером '
+                                 'применения изменений')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--host', default='localhost')
+
+    def handle(self, *args, **options):
+        if options['per_recipe'] > options['ingredients']:
+            raise CommandError('В рецепте не может быть больше ингредиентов, '
+                               'чем добавлено')
+        generator = random.Random(options['seed'])
+        with transaction.atomic():
+            ingredient_ids = self.fill(generator, options)
+            index = IngredientRecipeIndex()
+            queries = [generator.sample(ingredient_ids, QUERY_SIZE)
+                       for _ in range(options['requests'])]
+            started = time.perf_counter()
+            index.match(queries[0])
+            self.stdout.write(
+                f'Построение индекса: '
+                f'{(time.perf_counter() - started) * 1000:.0f} мс')
+            for min_match in (1, 2, 3):
+                self.report(f'Индекс, min_match={min_match}', [
+                    self.measure(lambda: index.match(query, min_match))
+                    for query in queries
+                ])
+            client = APIClient(HTTP_HOST=options['host'])
+            client.get(self.get_url(queries[0], 2))
+            self.report('/api/recipes/match/, min_match=2', [
+                self.measure(lambda: self.get_page(client, query))
+                for query in queries
+            ])
+            self.change_recipes(generator, ingredient_ids,
+                                options['changes'])
+            started = time.perf_counter()
+            index.match(queries[0])
+            self.stdout.write(
+                f'Применение изменений {options["changes"]} рецептов: '
+                f'{(time.perf_counter() - started) * 1000:.1f} мс')
+            transaction.set_rollback(True)
+
+    def fill(self, generator, options):
+        author = User.objects.create(username='benchmark_match',
+                                     email='benchmark_match@foodgram.local')
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'benchmark match {index:06}',
+                       measurement_unit='г')
+            for index in range(options['ingredients'])
+        )
+        ingredient_ids = list(Ingredient.objects.filter(
+            name__startswith='benchmark match '
+        ).values_list('pk', flat=True))
+        count = options['recipes']
+        for start in range(0, count, BATCH_SIZE):
+            Recipe.objects.bulk_create(
+                Recipe(author=author, name=f'benchmark {index}',
+                       text='benchmark', image='recipes/benchmark.jpg',
+                       cooking_time=5)
+                for index in range(start, min(start + BATCH_SIZE, count))
+            )
+        recipe_ids = Recipe.objects.filter(author=author).values_list(
+            'pk', flat=True).order_by('pk')
+        batch = []
+        for recipe_id in recipe_ids.iterator():
+            batch.extend(
+                IngredientInRecipe(recipe_id=recipe_id,
+                                   ingredient_id=ingredient_id, amount=10)
+                for ingredient_id in generator.sample(ingredient_ids,
+                                                      options['per_recipe'])
+            )
+            if len(batch) >= BATCH_SIZE:
+                IngredientInRecipe.objects.bulk_create(batch)
+                batch = []
+        IngredientInRecipe.objects.bulk_create(batch)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in (Recipe, IngredientInRecipe):
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+        return ingredient_ids
+
+    def change_recipes(self, generator, ingredient_ids, count):
+        recipe_ids = list(Recipe.objects.filter(
+            author__username='benchmark_match'
+        ).values_list('pk', flat=True)[:count])
+        for recipe_id in recipe_ids:
+            current = list(IngredientInRecipe.objects.filter(
+                recipe_id=recipe_id).values_list('ingredient_id', flat=True))
+            removed = generator.choice(current)
+            added = generator.choice(
+                [ingredient_id for ingredient_id in ingredient_ids
+                 if ingredient_id not in current])
+            IngredientInRecipe.objects.filter(
+                recipe_id=recipe_id, ingredient_id=removed).delete()
+            IngredientInRecipe.objects.create(
+                recipe_id=recipe_id, ingredient_id=added, amount=10)
+            record_recipe_changes(recipe_id, (removed, added))
+
+    def get_url(self, query, min_match):
+        ingredients = '&'.join(f'ingredients={ingredient_id}'
+                               for ingredient_id in query)
+        return f'/api/recipes/match/?{ingredients}&min_match={min_match}'
+
+    def get_page(self, client, query):
+        response = client.get(self.get_url(query, 2))
+        if response.status_code != 200:
+            raise CommandError(f'Код ответа {response.status_code}')
+
+    def measure(self, search):
+        started = time.perf_counter()
+        search()
+        return time.perf_counter() - started
+
+    def report(self, label, latencies):
+        latencies = sorted(latencies)
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f'{label}: медиана '
+            f'{statistics.median(latencies) * 1000:.2f} мс, '
+            f'95% {p95 * 1000:.2f} мс')
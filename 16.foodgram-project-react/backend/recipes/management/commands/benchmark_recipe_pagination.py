@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from recipes.models import Recipe
+from recipes.pagination import CustomPagination, RecipeCursorPagination
+
+User = get_user_model()
+
+BATCH_SIZE = 10000
+DEPTHS = (0, 0.01, 0.1, 0.5, 0.99)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время получения страницы ленты рецептов при '
+            'постраничной и курсорной пагинации на разной глубине')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=1000000,
+                            help='Сколько временных рецептов добавить '
+                                 '(откатываются после замера)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Количество замеров на каждой глубине')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.fill_recipes(options['recipes'], options['seed'])
+            total = Recipe.objects.count()
+            for ordering in (('-created', '-id'),
+                             ('-favorites_count', '-created', '-id')):
+                self.stdout.write(f'Сортировка {", ".join(ordering)}, '
+                                  f'рецептов: {total}')
+                for depth in DEPTHS:
+                    self.report(int(total * depth), ordering,
+                                options['repeat'])
+            transaction.set_rollback(True)
+
+    def fill_recipes(self, count, seed):
+        if not count:
+            return
+        generator = random.Random(seed)
+        author = User.objects.create(username='benchmark_pagination',
+                                     email='benchmark@foodgram.local')
+        for start in range(0, count, BATCH_SIZE):
+            Recipe.objects.bulk_create(
+                Recipe(author=author, name=f'benchmark {index}',
+                       text='benchmark', image='recipes/benchmark.jpg',
+                       cooking_time=5,
+                       favorites_count=generator.randint(0, 50))
+                for index in range(start, min(start + BATCH_SIZE, count))
+            )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Recipe._meta.db_table}')
+
+    def report(self, offset, ordering, repeat):
+        page_size = CustomPagination.page_size
+        queryset = Recipe.objects.order_by(*ordering)
+        anchor = queryset[offset - 1] if offset else None
+        paginator = RecipeCursorPagination()
+
+        def get_offset_page():
+            queryset.count()
+            return list(queryset[offset:offset + page_size])
+
+        def get_cursor_page():
+            page = queryset
+            if anchor is not None:
+                page = paginator.filter_after(
+                    queryset, ordering,
+                    paginator._get_position_from_instance(anchor, ordering))
+            return list(page[:page_size + 1])[:page_size]
+
+        if get_offset_page() != get_cursor_page():
+            raise CommandError(f'Страницы на глубине {offset} не совпадают')
+        self.stdout.write(
+            f'  глубина {offset}: страницы с OFFSET '
+            f'{self.measure(get_offset_page, repeat) * 1000:.1f} мс, '
+            f'курсор {self.measure(get_cursor_page, repeat) * 1000:.1f} мс')
+
+    def measure(self, get_page, repeat):
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            get_page()
+            latencies.append(time.perf_counter() - started)
+        return statistics.median(latencies)
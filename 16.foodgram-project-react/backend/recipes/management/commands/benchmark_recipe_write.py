@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from recipes.models import Ingredient, Recipe, Tag
+from recipes.serializer import RecipeWriteSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Измеряет время и количество запросов при изменении рецепта '
+            'на временных данных, которые затем откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ingredients', type=int, default=20,
+                            help='Количество ингредиентов в рецепте')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество изменений в каждом сценарии')
+
+    def handle(self, *args, **options):
+        count = options['ingredients']
+        with transaction.atomic():
+            author = User.objects.create(username='benchmark_recipe_write',
+                                         email='benchmark@foodgram.local')
+            tag = Tag.objects.create(name='benchmark', hex_code='#000001',
+                                     slug='benchmark')
+            Ingredient.objects.bulk_create(
+                Ingredient(name=f'benchmark {index:06}', measurement_unit='г')
+                for index in range(count * 2)
+            )
+            ingredient_ids = list(Ingredient.objects.filter(
+                name__startswith='benchmark ').values_list('id', flat=True))
+            recipe = Recipe.objects.create(
+                author=author, name='benchmark', text='benchmark',
+                image='recipes/benchmark.jpg', cooking_time=5)
+            request = APIRequestFactory().patch('/')
+            request.user = author
+            first = ingredient_ids[:count]
+            second = ingredient_ids[count // 2:count // 2 + count]
+            self.update(recipe, request, tag, first, 1)
+            for label, get_ingredients in (
+                ('без изменений', lambda index: (first, 1)),
+                ('изменено количество',
+                 lambda index: (first, 1 + index % 2)),
+                ('заменена половина ингредиентов',
+                 lambda index: (second if index % 2 else first, 1)),
+            ):
+                self.report(label, [
+                    self.update(recipe, request, tag,
+                                *get_ingredients(index + 1))
+                    for index in range(options['repeat'])
+                ])
+            transaction.set_rollback(True)
+
+    def update(self, recipe, request, tag, ingredient_ids, amount):
+        recipe = Recipe.objects.get(pk=recipe.pk)
+        serializer = RecipeWriteSerializer(
+            recipe, context={'request': request}, partial=True,
+            data={'ingredients': [{'id': ingredient_id, 'amount': amount}
+                                  for ingredient_id in ingredient_ids],
+                  'tags': [tag.id], 'name': recipe.name,
+                  'text': recipe.text, 'cooking_time': recipe.cooking_time}
+        )
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            elapsed = time.perf_counter() - started
+        return elapsed, len(context.captured_queries)
+
+    def report(self, label, results):
+        latencies, queries = zip(*results)
+        self.stdout.write(
+            f'{label}: медиана {statistics.median(latencies) * 1000:.1f} мс, '
+            f'запросов к базе {statistics.median(queries):.0f}')
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.models import Ingredient, ShoppingListIngredient
+from recipes.renderers import (CSVShoppingListRenderer,
+                               JSONShoppingListRenderer,
+                               PDFShoppingListRenderer,
+                               TextShoppingListRenderer)
+from recipes.shopping_list import build_pdf, get_shopping_list
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Измеряет время выгрузки списка покупок в каждом формате '
+            'на временных данных, которые затем откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ingredients', type=int, default=200,
+                            help='Количество ингредиентов в списке покупок')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Количество повторов для каждого формата')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with transaction.atomic():
+            user = self.fill_shopping_list(options['ingredients'])
+            ingredients = get_shopping_list(user)
+            self.report('PDF без кеша', [
+                self.measure(lambda: [build_pdf(list(ingredients))])
+                for _ in range(repeat)
+            ])
+            for renderer in (PDFShoppingListRenderer(),
+                             TextShoppingListRenderer(),
+                             CSVShoppingListRenderer(),
+                             JSONShoppingListRenderer()):
+                self.report(renderer.format, [
+                    self.measure(lambda: renderer.stream(ingredients))
+                    for _ in range(repeat)
+                ])
+            transaction.set_rollback(True)
+
+    def fill_shopping_list(self, count):
+        user = User.objects.create(username='benchmark_shopping_list',
+                                   email='benchmark@foodgram.local')
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'benchmark {index:06}', measurement_unit='г')
+            for index in range(count)
+        )
+        ShoppingListIngredient.objects.bulk_create(
+            ShoppingListIngredient(author=user, ingredient=ingredient,
+                                   total_amount=ingredient.pk % 1000 + 1)
+            for ingredient in Ingredient.objects.filter(
+                name__startswith='benchmark ')
+        )
+        return user
+
+    def measure(self, get_chunks):
+        started = time.perf_counter()
+        first_chunk = None
+        size = 0
+        for chunk in get_chunks():
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            size += len(chunk)
+        return first_chunk or 0, time.perf_counter() - started, size
+
+    def report(self, label, results):
+        first_chunks, totals, sizes = zip(*results)
+        self.stdout.write(
+            f'{label}: первый фрагмент '
+            f'{statistics.median(first_chunks) * 1000:.1f} мс, '
+            f'весь ответ {statistics.median(totals) * 1000:.1f} мс, '
+            f'{sizes[0]} байт')
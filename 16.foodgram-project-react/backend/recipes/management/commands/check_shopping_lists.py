@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipes.models import ShoppingListIngredient
+from recipes.shopping_list import calculate_shopping_list_totals
+
+
+class Command(BaseCommand):
+    help = ('Сверяет сохранённые суммы ингредиентов в списках покупок '
+            'с рецептами в корзинах и при необходимости пересобирает их')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true',
+                            help='Заменить сохранённые суммы пересчитанными')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = calculate_shopping_list_totals()
+            stored = {
+                (author_id, ingredient_id): total_amount
+                for author_id, ingredient_id, total_amount
+                in ShoppingListIngredient.objects.select_for_update(
+                ).values_list('author_id', 'ingredient_id', 'total_amount')
+            }
+            diff = sorted(key for key in expected.keys() | stored.keys()
+                          if expected.get(key) != stored.get(key))
+            for author_id, ingredient_id in diff:
+                self.stdout.write(
+                    f'Пользователь {author_id}, ингредиент {ingredient_id}: '
+                    f'сохранено {stored.get((author_id, ingredient_id))}, '
+                    f'ожидается {expected.get((author_id, ingredient_id))}'
+                )
+            if not diff:
+                self.stdout.write(self.style.SUCCESS('Расхождений нет'))
+                return
+            if not options['fix']:
+                raise CommandError(f'Найдено расхождений: {len(diff)}')
+            ShoppingListIngredient.objects.all().delete()
+            ShoppingListIngredient.objects.bulk_create(
+                ShoppingListIngredient(author_id=author_id,
+                                       ingredient_id=ingredient_id,
+                                       total_amount=total_amount)
+                for (author_id, ingredient_id), total_amount
+                in expected.items()
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено расхождений: {len(diff)}'))
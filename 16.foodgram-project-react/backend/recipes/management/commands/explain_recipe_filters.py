@@ -0,0 +1,96 @@
+import re
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.request import Request
+
+from recipes.models import (Favourite, IngredientInRecipe, Recipe,
+                            ShoppingList, Tag)
+from recipes.views import RecipeViewSet
+from users.models import User
+
+SEQ_SCAN_PATTERNS = (
+    re.compile(r'Seq Scan on (\w+)()'),
+    re.compile(r'SCAN (?:TABLE )?(\w+)(?: AS (\w+))?\s*$', re.MULTILINE),
+)
+ALIAS_PATTERN = re.compile(r'"(\w+)" (?:AS )?"?([UT]\d+)\b')
+WATCHED_MODELS = (Recipe, Recipe.tags.through, Favourite, ShoppingList,
+                  IngredientInRecipe)
+
+
+class Command(BaseCommand):
+    help = ('Строит планы запросов для всех сочетаний фильтров рецептов '
+            'и завершается ошибкой, если в них есть последовательное '
+            'сканирование больших таблиц')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int,
+                            help='id пользователя, от имени которого '
+                                 'строятся запросы')
+        parser.add_argument('--limit', type=int, default=6,
+                            help='Размер страницы')
+
+    def get_user(self, user_id):
+        if user_id is not None:
+            return User.objects.get(pk=user_id)
+        user = (User.objects.filter(favs__isnull=False).first()
+                or User.objects.first())
+        if user is None:
+            raise CommandError('В базе нет пользователей')
+        return user
+
+    def get_params(self, user):
+        params = {
+            'author': [str(user.pk)],
+            'tags': list(Tag.objects.values_list('slug', flat=True)[:2]),
+            'is_favorited': ['true'],
+            'is_in_shopping_cart': ['true'],
+            'ordering': ['-favorites_count'],
+        }
+        for size in range(len(params) + 1):
+            for names in combinations(params, size):
+                yield {name: params[name] for name in names}
+
+    def get_queryset(self, request):
+        view = RecipeViewSet(action='list', request=request, args=(),
+                             kwargs={}, format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def get_scans(self, queryset, plan):
+        sql, _ = queryset.query.sql_with_params()
+        aliases = {alias: table
+                   for table, alias in ALIAS_PATTERN.findall(sql)}
+        return {
+            aliases.get(alias or table, table)
+            for pattern in SEQ_SCAN_PATTERNS
+            for table, alias in pattern.findall(plan)
+        }
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+        watched = {model._meta.db_table for model in WATCHED_MODELS}
+        factory = APIRequestFactory()
+        failures = 0
+        for params in self.get_params(user):
+            django_request = factory.get('/api/recipes/', params)
+            force_authenticate(django_request, user=user)
+            request = Request(django_request)
+            request.user = user
+            queryset = self.get_queryset(request)[:options['limit']]
+            plan = queryset.explain()
+            scans = sorted(self.get_scans(queryset, plan) & watched)
+            label = ', '.join(params) or 'без фильтров'
+            if scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(
+                    f'{label}: последовательное сканирование '
+                    f'{", ".join(scans)}'))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{label}: OK'))
+        if failures:
+            raise CommandError(f'Планов с последовательным сканированием: '
+                               f'{failures}')
+        self.stdout.write(f'Проверено на {connection.vendor}')
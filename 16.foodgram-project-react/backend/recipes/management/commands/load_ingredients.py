@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from recipes.catalogue import bump_version
+from recipes.models import Ingredient
+
+HEADER = ['name', 'measurement_unit']
+JSON_CHUNK_SIZE = 64 * 1024
+JSON_SEPARATORS = '[], \t\r\n'
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if not row or row == HEADER:
+                continue
+            if len(row) != len(HEADER):
+                raise CommandError(
+                    f'Строка {reader.line_num}: ожидалось {len(HEADER)} '
+                    f'столбца, получено {len(row)}')
+            yield row[0].strip(), row[1].strip()
+
+
+def iter_json_objects(file, chunk_size=JSON_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_SEPARATORS:
+            position += 1
+        if position < len(buffer):
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                if eof:
+                    raise CommandError(f'Некорректный JSON: {error}')
+            else:
+                yield item
+                continue
+        elif eof:
+            return
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def read_json(path):
+    with open(path, encoding='utf-8') as file:
+        for number, item in enumerate(iter_json_objects(file), 1):
+            if not isinstance(item, dict):
+                raise CommandError(
+                    f'Запись {number}: ожидался JSON-объект ингредиента')
+            if (item.get('model', 'recipes.ingredient')
+                    != 'recipes.ingredient'):
+                continue
+            fields = item.get('fields', item)
+            try:
+                yield (fields['name'].strip(),
+                       fields['measurement_unit'].strip())
+            except (KeyError, TypeError, AttributeError):
+                raise CommandError(
+                    f'Запись {number}: ожидались строковые поля '
+                    f'{", ".join(HEADER)}')
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    batch = list(islice(rows, size))
+    while batch:
+        yield batch
+        batch = list(islice(rows, size))
+
+
+class Command(BaseCommand):
+    help = 'Загружает ингредиенты из CSV- или JSON-файла'
+    readers = {'csv': read_csv, 'json': read_json}
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу с ингредиентами')
+        parser.add_argument('--format', choices=tuple(self.readers),
+                            help='Формат файла, по умолчанию – по расширению')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--copy', action='store_true',
+                            help='Использовать COPY (только PostgreSQL)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'Файл {path} не найден')
+        file_format = (options['format']
+                       or os.path.splitext(path)[1].lstrip('.').lower())
+        if file_format not in self.readers:
+            raise CommandError(f'Неизвестный формат файла: {file_format}')
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError('COPY доступен только для PostgreSQL')
+        rows = self.readers[file_format](path)
+        load = self.copy_batches if options['copy'] else self.insert_batches
+        count_before = Ingredient.objects.count()
+        started = time.monotonic()
+        with transaction.atomic():
+            processed = load(batches(rows, options['batch_size']))
+        elapsed = time.monotonic() - started
+        created = Ingredient.objects.count() - count_before
+        if created:
+            bump_version('ingredients')
+        speed = processed / elapsed if elapsed else processed
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано строк: {processed}, добавлено: {created}, '
+            f'{speed:.0f} строк/с'
+        ))
+
+    def insert_batches(self, batches):
+        processed = 0
+        for batch in batches:
+            Ingredient.objects.bulk_create(
+                (Ingredient(name=name, measurement_unit=unit)
+                 for name, unit in batch),
+                ignore_conflicts=True
+            )
+            processed += len(batch)
+        return processed
+
+    def copy_batches(self, batches):
+        table = Ingredient._meta.db_table
+        processed = 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMPORARY TABLE ingredient_import '
+                '(name varchar(100), measurement_unit varchar(10)) '
+                'ON COMMIT DROP'
+            )
+            for batch in batches:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(batch)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    'COPY ingredient_import (name, measurement_unit) '
+                    'FROM STDIN WITH CSV', buffer)
+                processed += len(batch)
+            cursor.execute(
+                f'INSERT INTO {table} (name, measurement_unit) '
+                'SELECT DISTINCT name, measurement_unit '
+                'FROM ingredient_import '
+                'ON CONFLICT (name, measurement_unit) DO NOTHING'
+            )
+        return processed
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from recipes.images import save_renditions
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = ('Готовит уменьшенные копии изображений рецептов, для которых '
+            'они ещё не созданы')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Пересоздать копии для всех рецептов')
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.exclude(image='')
+        if not options['all']:
+            recipes = recipes.filter(renditions_ready=False)
+        done = failed = 0
+        for pk, name in recipes.values_list('pk', 'image').iterator():
+            if save_renditions(pk, name):
+                done += 1
+            else:
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Подготовлено: {done}, с ошибками: {failed}'))
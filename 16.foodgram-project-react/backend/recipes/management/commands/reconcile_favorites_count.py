@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from recipes.models import Favourite, Recipe
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает количество добавлений рецептов в "Избранное" '
+            'и исправляет расхождения')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = []
+            actual_count = Favourite.objects.filter(
+                recipe=OuterRef('pk')
+            ).values('recipe').annotate(count=Count('pk')).values('count')
+            recipes = Recipe.objects.select_for_update().annotate(
+                actual_count=Coalesce(Subquery(actual_count,
+                                               output_field=IntegerField()), 0)
+            ).only('id', 'favorites_count').order_by()
+            for recipe in recipes.iterator():
+                if recipe.favorites_count != recipe.actual_count:
+                    recipe.favorites_count = recipe.actual_count
+                    drifted.append(recipe)
+            Recipe.objects.bulk_update(drifted, ('favorites_count',),
+                                       batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено рецептов: {len(drifted)}'))
@@ -0,0 +1,54 @@
+# Generated by Django 2.2.6 on 2026-10-17 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def fill_shopping_list_ingredients(apps, schema_editor):
+    IngredientInRecipe = apps.get_model('recipes', 'IngredientInRecipe')
+    ShoppingListIngredient = apps.get_model('recipes',
+                                            'ShoppingListIngredient')
+    totals = IngredientInRecipe.objects.filter(
+        recipe__shop_recipes__isnull=False
+    ).values_list(
+        'recipe__shop_recipes__author', 'ingredient'
+    ).annotate(total_amount=Sum('amount')).order_by()
+    ShoppingListIngredient.objects.bulk_create(
+        ShoppingListIngredient(author_id=author_id,
+                               ingredient_id=ingredient_id,
+                               total_amount=total_amount)
+        for author_id, ingredient_id, total_amount in totals
+        if total_amount > 0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingListIngredient',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_amount', models.IntegerField(verbose_name='Общее количество')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list_ingredients', to=settings.AUTH_USER_MODEL, verbose_name='Автор списка покупок')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.Ingredient', verbose_name='Ингредиент')),
+            ],
+            options={
+                'verbose_name': 'Ингредиент в списке покупок',
+                'verbose_name_plural': 'Ингредиенты в списке покупок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='shoppinglistingredient',
+            constraint=models.UniqueConstraint(fields=('author', 'ingredient'), name='OneIngredientPerShoppingList'),
+        ),
+        migrations.RunPython(fill_shopping_list_ingredients,
+                             migrations.RunPython.noop),
+    ]
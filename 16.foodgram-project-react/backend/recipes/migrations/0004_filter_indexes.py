@@ -0,0 +1,25 @@
+# Generated by Django 2.2.6 on 2026-10-17 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favourite',
+            index=models.Index(fields=['recipe', 'author'], name='favourite_recipe_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-created'], name='recipe_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shoppinglist',
+            index=models.Index(fields=['recipe', 'author'], name='shoppinglist_recipe_author_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 2.2.6 on 2026-10-17 15:25
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_favorites_count(apps, schema_editor):
+    Favourite = apps.get_model('recipes', 'Favourite')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    favourites = Favourite.objects.filter(
+        recipe=OuterRef('pk')
+    ).values('recipe').annotate(count=Count('pk')).values('count')
+    Recipe.objects.update(favorites_count=Coalesce(
+        Subquery(favourites, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество добавлений в "Избранное"'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-favorites_count', '-created'], name='recipe_favorites_count_idx'),
+        ),
+        migrations.RunPython(fill_favorites_count,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.6 on 2026-10-17 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_favorites_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='renditions_ready',
+            field=models.BooleanField(default=False, verbose_name='Уменьшенные копии изображения готовы'),
+        ),
+    ]
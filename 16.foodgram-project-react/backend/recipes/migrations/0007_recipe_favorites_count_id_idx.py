@@ -0,0 +1,21 @@
+# Generated by Django 2.2.6 on 2026-10-17 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_recipe_renditions_ready'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='recipe',
+            name='recipe_favorites_count_idx',
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-favorites_count', '-created', '-id'], name='recipe_favorites_count_idx'),
+        ),
+    ]
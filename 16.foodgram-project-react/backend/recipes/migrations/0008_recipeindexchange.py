@@ -0,0 +1,26 @@
+# Generated by Django 2.2.6 on 2026-10-17 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_recipe_favorites_count_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeIndexChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipe_id', models.IntegerField(verbose_name='Рецепт')),
+                ('ingredient_id', models.IntegerField(verbose_name='Ингредиент')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Изменение индекса ингредиентов',
+                'verbose_name_plural': 'Изменения индекса ингредиентов',
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import (BooleanField, Exists, OuterRef, Prefetch,
+                              Subquery, Value)
 
 
 class Ingredient(models.Model):
@@ -33,6 +35,36 @@ class Tag(models.Model):
         return self.name
 
 
+class RecipeQuerySet(models.QuerySet):
+
+    def with_user_flags(self, user):
+        if user.is_anonymous:
+            return self.annotate(
+                is_favorited=Value(False, output_field=BooleanField()),
+                is_in_shopping_cart=Value(False, output_field=BooleanField())
+            )
+        return self.annotate(
+            is_favorited=Exists(Favourite.objects.filter(
+                author=user, recipe=OuterRef('pk'))),
+            is_in_shopping_cart=Exists(ShoppingList.objects.filter(
+                author=user, recipe=OuterRef('pk')))
+        )
+
+    def for_read(self):
+        return self.select_related('author').prefetch_related(
+            'tags',
+            Prefetch('ings_in_recipe',
+                     queryset=IngredientInRecipe.objects.select_related(
+                         'ingredient'))
+        )
+
+    def latest_by_author(self, limit, author_ids):
+        latest = self.model.objects.filter(
+            author=OuterRef('author')
+        ).order_by('-created', '-id').values('pk')[:limit]
+        return self.filter(author__in=author_ids, pk__in=Subquery(latest))
+
+
 class Recipe(models.Model):
     author = models.ForeignKey('users.User', on_delete=models.CASCADE,
                                related_name='recipes',
@@ -54,9 +86,27 @@ class Recipe(models.Model):
         auto_now_add=True,
         verbose_name='Дата добавления рецепта на сайт'
     )
+    favorites_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество добавлений в "Избранное"'
+    )
+    renditions_ready = models.BooleanField(
+        default=False,
+        verbose_name='Уменьшенные копии изображения готовы'
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         ordering = ('-created',)
+        indexes = (
+            models.Index(fields=('-created', '-id'),
+                         name='recipe_created_id_idx'),
+            models.Index(fields=('author', '-created'),
+                         name='recipe_author_created_idx'),
+            models.Index(fields=('-favorites_count', '-created', '-id'),
+                         name='recipe_favorites_count_idx'),
+        )
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
 
@@ -95,6 +145,8 @@ class Favourite(models.Model):
     class Meta:
         verbose_name = 'Интересный рецепт'
         verbose_name_plural = 'Интересные рецепты'
+        indexes = (models.Index(fields=('recipe', 'author'),
+                                name='favourite_recipe_author_idx'),)
         constraints = (models.UniqueConstraint(fields=('author', 'recipe'),
                        name='NoDuplicateRecipeInFavourite'),)
 
@@ -110,5 +162,34 @@ class ShoppingList(models.Model):
     class Meta:
         verbose_name = 'Рецепт в списке покупок'
         verbose_name_plural = 'Рецепты в списке покупок'
+        indexes = (models.Index(fields=('recipe', 'author'),
+                                name='shoppinglist_recipe_author_idx'),)
         constraints = (models.UniqueConstraint(fields=('author', 'recipe'),
                        name='NoDuplicateRecipeInShoppingList'),)
+
+
+class ShoppingListIngredient(models.Model):
+    author = models.ForeignKey('users.User', on_delete=models.CASCADE,
+                               related_name='shopping_list_ingredients',
+                               verbose_name='Автор списка покупок')
+    ingredient = models.ForeignKey(Ingredient, on_delete=models.CASCADE,
+                                   verbose_name='Ингредиент')
+    total_amount = models.IntegerField(verbose_name='Общее количество')
+
+    class Meta:
+        verbose_name = 'Ингредиент в списке покупок'
+        verbose_name_plural = 'Ингредиенты в списке покупок'
+        constraints = (models.UniqueConstraint(
+            fields=('author', 'ingredient'),
+            name='OneIngredientPerShoppingList'),)
+
+
+class RecipeIndexChange(models.Model):
+    recipe_id = models.IntegerField(verbose_name='Рецепт')
+    ingredient_id = models.IntegerField(verbose_name='Ингредиент')
+    created = models.DateTimeField(auto_now_add=True, db_index=True,
+                                   verbose_name='Дата изменения')
+
+    class Meta:
+        verbose_name = 'Изменение индекса ингредиентов'
+        verbose_name_plural = 'Изменения индекса ингредиентов'
@@ -1,6 +1,100 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return plan[0]['Plan']['Plan Rows']
 
 
 class CustomPagination(PageNumberPagination):
     page_size_query_param = 'limit'
     page_size = 6
+
+
+class RecipeCursorPagination(CursorPagination):
+    page_size_query_param = 'limit'
+    page_size = 6
+    ordering = ('-created', '-id')
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'estimated':
+            self.count = estimate_count(queryset)
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+        ordering = (tuple(field[1:] if field.startswith('-') else f'-{field}'
+                          for field in self.ordering)
+                    if reverse else self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = self.filter_after(queryset, ordering, position)
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > self.page_size:
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering)
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = following_position is not None
+            self.next_position = position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = position is not None
+            self.next_position = following_position
+            self.previous_position = position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def filter_after(self, queryset, ordering, position):
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        after = Q()
+        for index, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            after |= Q(**{
+                **{previous.lstrip('-'): value
+                   for previous, value in zip(ordering[:index], values)},
+                f'{field.lstrip("-")}__{lookup}': values[index]
+            })
+        try:
+            return queryset.filter(after)
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        return json.dumps([getattr(instance, field.lstrip('-'))
+                           for field in ordering], default=str)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data['count'] = self.count
+            response.data.move_to_end('count', last=False)
+        return response
@@ -0,0 +1,182 @@
+import bisect
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .catalogue import bump_version, get_version
+from .models import IngredientInRecipe, RecipeIndexChange
+
+VERSION_NAME = 'recipe_ingredients'
+EMPTY_POSTINGS = array('q')
+CHANGES_RETENTION = timedelta(hours=1)
+# A change row that is missing below the newest one seen may belong to a
+# transaction that has not committed yet, so it is looked up again until
+# it appears or GAP_TIMEOUT seconds pass.
+GAP_TIMEOUT = 60
+GAP_LOOKBACK = 500
+
+
+def record_changes(pairs):
+    pairs = set(pairs)
+    if not pairs:
+        return
+    RecipeIndexChange.objects.bulk_create(
+        RecipeIndexChange(recipe_id=recipe_id, ingredient_id=ingredient_id)
+        for recipe_id, ingredient_id in pairs
+    )
+    RecipeIndexChange.objects.filter(
+        created__lt=timezone.now() - CHANGES_RETENTION).delete()
+
+
+def record_recipe_changes(recipe_id, ingredient_ids):
+    record_changes((recipe_id, ingredient_id)
+                   for ingredient_id in ingredient_ids)
+
+
+class IngredientRecipeIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._generation = 0
+        self._version = None
+        self._postings = None
+        self._last_change = 0
+        self._gaps = {}
+        self._polled = None
+
+    def _is_stale(self, version):
+        return (self._postings is None or self._version != version
+                or time.monotonic() - self._polled
+                >= CHANGES_RETENTION.total_seconds() / 2)
+
+    def _load(self):
+        version = get_version(VERSION_NAME)
+        with self._lock:
+            if not self._is_stale(version):
+                postings = self._postings
+                generation = None
+            else:
+                self._generation += 1
+                self._postings = None
+                generation = self._generation
+        if generation is not None:
+            return self._load_postings(version, generation)
+        if self._poll_lock.acquire(blocking=False):
+            try:
+                self._poll()
+            finally:
+                self._poll_lock.release()
+        return postings
+
+    def _load_postings(self, version, generation):
+        now = time.monotonic()
+        last_change = RecipeIndexChange.objects.aggregate(
+            last=Max('pk'))['last'] or 0
+        committed = set(RecipeIndexChange.objects.filter(
+            pk__gt=last_change - GAP_LOOKBACK
+        ).values_list('pk', flat=True))
+        gaps = {change_id: now for change_id
+                in range(max(last_change - GAP_LOOKBACK, 0) + 1,
+                         last_change + 1)
+                if change_id not in committed}
+        postings = {}
+        rows = IngredientInRecipe.objects.values_list(
+            'ingredient_id', 'recipe_id'
+        ).order_by('ingredient_id', 'recipe_id').iterator()
+        for ingredient_id, recipe_id in rows:
+            postings.setdefault(ingredient_id, array('q')).append(recipe_id)
+        with self._lock:
+            if self._generation == generation:
+                self._postings, self._version = postings, version
+                self._last_change, self._gaps = last_change, gaps
+                self._polled = now
+        return postings
+
+    def _poll(self):
+        with self._lock:
+            generation = self._generation
+            last_change, gaps = self._last_change, dict(self._gaps)
+        now = time.monotonic()
+        gaps = {change_id: seen for change_id, seen in gaps.items()
+                if now - seen < GAP_TIMEOUT}
+        changes = list(RecipeIndexChange.objects.filter(
+            Q(pk__gt=last_change) | Q(pk__in=list(gaps))
+        ).values_list('pk', 'recipe_id', 'ingredient_id').order_by('pk'))
+        pairs = {(recipe_id, ingredient_id)
+                 for _, recipe_id, ingredient_id in changes}
+        present = set()
+        if pairs:
+            present = set(IngredientInRecipe.objects.filter(
+                recipe_id__in={recipe_id for recipe_id, _ in pairs},
+                ingredient_id__in={ingredient_id for _, ingredient_id in pairs}
+            ).values_list('recipe_id', 'ingredient_id'))
+        seen = {change_id for change_id, _, _ in changes}
+        newest = max(seen, default=last_change)
+        for change_id in range(last_change + 1, newest):
+            gaps.setdefault(change_id, now)
+        for change_id in seen:
+            gaps.pop(change_id, None)
+        with self._lock:
+            if self._generation != generation or self._postings is None:
+                return
+            self._apply(pairs, present)
+            self._last_change = max(newest, last_change)
+            self._gaps = gaps
+            self._polled = now
+
+    def _apply(self, pairs, present):
+        by_ingredient = defaultdict(list)
+        for recipe_id, ingredient_id in pairs:
+            by_ingredient[ingredient_id].append(recipe_id)
+        for ingredient_id, recipe_ids in by_ingredient.items():
+            postings = array(
+                'q', self._postings.get(ingredient_id, EMPTY_POSTINGS))
+            for recipe_id in recipe_ids:
+                position = bisect.bisect_left(postings, recipe_id)
+                found = (position < len(postings)
+                         and postings[position] == recipe_id)
+                if (recipe_id, ingredient_id) in present:
+                    if not found:
+                        postings.insert(position, recipe_id)
+                elif found:
+                    del postings[position]
+            self._postings[ingredient_id] = postings
+
+    def match(self, ingredient_ids, min_match=1):
+        postings = self._load()
+        lists = sorted((postings.get(ingredient_id, EMPTY_POSTINGS)
+                        for ingredient_id in set(ingredient_ids)), key=len)
+        if not 1 <= min_match <= len(lists):
+            return []
+        # A recipe matching min_match ingredients is absent from at most
+        # len(lists) - min_match lists, so it has to be in one of the
+        # shortest len(lists) - min_match + 1 of them.
+        split = len(lists) - min_match + 1
+        counts = Counter()
+        for recipe_ids in lists[:split]:
+            counts.update(recipe_ids)
+        for recipe_ids in lists[split:]:
+            for recipe_id in counts:
+                position = bisect.bisect_left(recipe_ids, recipe_id)
+                if (position < len(recipe_ids)
+                        and recipe_ids[position] == recipe_id):
+                    counts[recipe_id] += 1
+        return sorted(((recipe_id, count)
+                       for recipe_id, count in counts.items()
+                       if count >= min_match),
+                      key=lambda match: (-match[1], -match[0]))
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._postings = None
+            bump_version(VERSION_NAME)
+
+
+recipe_index = IngredientRecipeIndex()
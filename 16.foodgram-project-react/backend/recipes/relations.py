@@ -0,0 +1,24 @@
+from .models import Favourite, ShoppingList
+from users.models import Subscribe
+
+
+class UserRelations:
+
+    def __init__(self, user, recipes, authors=()):
+        self.favorite_ids = set()
+        self.shopping_cart_ids = set()
+        self.following_ids = set()
+        if user.is_anonymous:
+            return
+        recipe_ids = [recipe.pk for recipe in recipes]
+        author_ids = ({recipe.author_id for recipe in recipes}
+                      | {author.pk for author in authors})
+        self.favorite_ids = set(Favourite.objects.filter(
+            author=user, recipe_id__in=recipe_ids
+        ).values_list('recipe_id', flat=True))
+        self.shopping_cart_ids = set(ShoppingList.objects.filter(
+            author=user, recipe_id__in=recipe_ids
+        ).values_list('recipe_id', flat=True))
+        self.following_ids = set(Subscribe.objects.filter(
+            user=user, following_id__in=author_ids
+        ).values_list('following_id', flat=True))
@@ -0,0 +1,68 @@
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from .shopping_list import get_shopping_list_pdf, iter_chunks
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+class ShoppingListRenderer(BaseRenderer):
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            data = data.get('detail', data)
+        return str(data).encode(self.charset or 'utf-8')
+
+    def stream(self, ingredients):
+        raise NotImplementedError('.stream() must be implemented.')
+
+
+class PDFShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+
+    def stream(self, ingredients):
+        return iter_chunks(get_shopping_list_pdf(list(ingredients)))
+
+
+class TextShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+
+    def stream(self, ingredients):
+        for name, unit, amount in ingredients.iterator():
+            yield f'{name}: {amount} {unit}\n'.encode(self.charset)
+
+
+class CSVShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def stream(self, ingredients):
+        writer = csv.writer(Echo())
+        yield writer.writerow(
+            ('name', 'measurement_unit', 'amount')).encode(self.charset)
+        for row in ingredients.iterator():
+            yield writer.writerow(row).encode(self.charset)
+
+
+class JSONShoppingListRenderer(ShoppingListRenderer):
+    media_type = 'application/json'
+    format = 'json'
+
+    def stream(self, ingredients):
+        separator = '['
+        for name, unit, amount in ingredients.iterator():
+            item = json.dumps({'name': name, 'measurement_unit': unit,
+                               'amount': amount}, ensure_ascii=False)
+            yield f'{separator}{item}'.encode(self.charset)
+            separator = ','
+        yield ('[]' if separator == '[' else ']').encode(self.charset)
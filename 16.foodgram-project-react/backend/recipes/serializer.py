@@ -1,11 +1,17 @@
-from drf_extra_fields.fields import Base64ImageField
+from django.db import transaction
 from rest_framework import serializers
 
+from .images import (RecipeImageField, get_rendition_urls,
+                     schedule_renditions)
 from .models import (Favourite, Ingredient,
                      IngredientInRecipe, Recipe, ShoppingList, Tag)
+from .recipe_index import record_recipe_changes
+from .shopping_list import change_recipe_in_shopping_lists
 from users.models import User
 from users.serializer import UserSerializer
 
+MAX_BATCH_SIZE = 100
+
 
 class IngredientSerializer(serializers.ModelSerializer):
 
@@ -49,18 +55,27 @@ class RecipeReadSerializer(serializers.ModelSerializer):
     tags = TagSerializer(read_only=True, many=True)
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    images = serializers.SerializerMethodField()
 
     class Meta:
         model = Recipe
         fields = ('id', 'tags', 'author', 'ingredients', 'is_favorited',
                   'is_in_shopping_cart', 'name',
-                  'image', 'text', 'cooking_time')
+                  'image', 'images', 'text', 'cooking_time')
 
     def get_ingredients(self, obj):
         ing_list = obj.ings_in_recipe.all()
         return IngredientInRecipeSerializer(ing_list, many=True).data
 
+    def get_images(self, obj):
+        if not obj.image:
+            return None
+        return get_rendition_urls(obj, self.context.get('request'))
+
     def get_is_favorited(self, obj):
+        relations = self.context.get('relations')
+        if relations is not None:
+            return obj.pk in relations.favorite_ids
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
@@ -68,6 +83,9 @@ class RecipeReadSerializer(serializers.ModelSerializer):
         return Favourite.objects.filter(author=author, recipe=obj).exists()
 
     def get_is_in_shopping_cart(self, obj):
+        relations = self.context.get('relations')
+        if relations is not None:
+            return obj.pk in relations.shopping_cart_ids
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
@@ -76,7 +94,7 @@ class RecipeReadSerializer(serializers.ModelSerializer):
 
 
 class RecipeWriteSerializer(serializers.ModelSerializer):
-    image = Base64ImageField()
+    image = RecipeImageField()
     author = UserSerializer(read_only=True)
     ingredients = IngredientInRecipeSerializer(many=True,
                                                source='ings_in_recipe')
@@ -116,30 +134,85 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         return ingredients, tags
 
     def save_ingredients(self, ingredients, recipe):
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(recipe=recipe,
+                               ingredient=ingredient['ingredient'],
+                               amount=ingredient.get('amount'))
+            for ingredient in ingredients
+        )
+
+    def sync_ingredients(self, ingredients, recipe):
+        current = {ing_in_recipe.ingredient_id: ing_in_recipe
+                   for ing_in_recipe in recipe.ings_in_recipe.all()}
+        to_create = []
+        to_update = []
+        amounts = {}
         for ingredient in ingredients:
-            ingredients_in_recipe = IngredientInRecipe.objects.create(
-                recipe=recipe, ingredient=ingredient['ingredient'],
-                amount=ingredient.get('amount'))
-            ingredients_in_recipe.save()
+            ing_in_recipe = current.pop(ingredient['ingredient'].id, None)
+            if ing_in_recipe is None:
+                to_create.append(ingredient)
+                amounts[ingredient['ingredient'].id] = ingredient.get('amount')
+            elif ing_in_recipe.amount != ingredient.get('amount'):
+                amounts[ing_in_recipe.ingredient_id] = (
+                    ingredient.get('amount') - ing_in_recipe.amount)
+                ing_in_recipe.amount = ingredient.get('amount')
+                to_update.append(ing_in_recipe)
+        for ingredient_id, ing_in_recipe in current.items():
+            amounts[ingredient_id] = -ing_in_recipe.amount
+        if current:
+            IngredientInRecipe.objects.filter(
+                pk__in=[ing_in_recipe.pk
+                        for ing_in_recipe in current.values()]).delete()
+        if to_update:
+            IngredientInRecipe.objects.bulk_update(to_update, ('amount',))
+        if to_create:
+            self.save_ingredients(to_create, recipe)
+        change_recipe_in_shopping_lists(recipe, amounts)
+        record_recipe_changes(
+            recipe.pk,
+            [*(ingredient['ingredient'].id for ingredient in to_create),
+             *current]
+        )
 
+    @transaction.atomic
     def create(self, validated_data):
         ingredients, tags = self.get_nested(validated_data)
         author = self.context.get('request').user
         recipe = Recipe.objects.create(author=author, **validated_data)
         self.save_ingredients(ingredients, recipe)
+        record_recipe_changes(
+            recipe.pk,
+            [ingredient['ingredient'].id for ingredient in ingredients]
+        )
         recipe.tags.set(tags)
+        schedule_renditions(recipe)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        instance.tags.clear()
         ingredients, tags = self.get_nested(validated_data)
-        for tag_id in tags:
-            instance.tags.add(tag_id)
-        IngredientInRecipe.objects.filter(recipe=instance).delete()
-        self.save_ingredients(ingredients, instance)
-        if validated_data.get('image') is not None:
-            instance.image = validated_data.get('image')
-        return super().update(instance, validated_data)
+        instance.tags.set(tags)
+        self.sync_ingredients(ingredients, instance)
+        if validated_data.get('image') is None:
+            validated_data.pop('image', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        update_fields = list(validated_data)
+        if 'image' in validated_data:
+            instance.renditions_ready = False
+            update_fields.append('renditions_ready')
+        instance.save(update_fields=update_fields)
+        if 'image' in validated_data:
+            schedule_renditions(instance)
+        return instance
+
+    def save(self, **kwargs):
+        try:
+            return super().save(**kwargs)
+        finally:
+            image = self.validated_data.get('image')
+            if image is not None:
+                image.close()
 
     def to_representation(self, instance):
         request = self.context.get('request')
@@ -198,3 +271,20 @@ class FavouriteSerializer(serializers.ModelSerializer):
         recipe = FourFieldRecipeSerializer(instance.recipe,
                                            context={'request': request}).data
         return recipe
+
+
+class RecipeBatchSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE
+    )
+
+
+class RecipeMatchSerializer(serializers.Serializer):
+    ingredients = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE
+    )
+    min_match = serializers.IntegerField(min_value=1, default=1)
@@ -0,0 +1,150 @@
+import hashlib
+import io
+import os
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from reportlab import rl_config
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from .models import IngredientInRecipe, ShoppingList, ShoppingListIngredient
+
+FONT_NAME = 'Roboto'
+FONT_FILE = 'Roboto-Regular.ttf'
+FONT_SIZE = 14
+TOP = 10.5 * inch
+BOTTOM = inch
+CACHE_TIMEOUT = 60 * 60 * 24
+CHUNK_SIZE = 8192
+CACHE_ALIAS = 'shopping_lists'
+
+
+def register_fonts():
+    rl_config.TTFSearchPath.append(os.path.join(settings.BASE_DIR, 'fonts'))
+    pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_FILE))
+
+
+def get_shopping_list(user):
+    return ShoppingListIngredient.objects.filter(
+        author=user.pk
+    ).values_list(
+        'ingredient__name',
+        'ingredient__measurement_unit',
+        'total_amount'
+    ).order_by('ingredient__name', 'ingredient__measurement_unit')
+
+
+def calculate_shopping_list_totals():
+    totals = IngredientInRecipe.objects.filter(
+        recipe__shop_recipes__isnull=False
+    ).values_list(
+        'recipe__shop_recipes__author', 'ingredient'
+    ).annotate(total_amount=Sum('amount')).order_by()
+    return {(author_id, ingredient_id): total_amount
+            for author_id, ingredient_id, total_amount in totals
+            if total_amount > 0}
+
+
+def update_shopping_list_totals(author_ids, amounts):
+    amounts = {ingredient_id: amount
+               for ingredient_id, amount in amounts.items() if amount}
+    if not author_ids or not amounts:
+        return
+    ShoppingListIngredient.objects.bulk_create(
+        (ShoppingListIngredient(author_id=author_id,
+                                ingredient_id=ingredient_id,
+                                total_amount=0)
+         for author_id in author_ids
+         for ingredient_id, amount in amounts.items() if amount > 0),
+        ignore_conflicts=True
+    )
+    totals = ShoppingListIngredient.objects.filter(
+        author_id__in=author_ids, ingredient_id__in=amounts)
+    totals.update(total_amount=F('total_amount') + Case(
+        *(When(ingredient_id=ingredient_id, then=Value(amount))
+          for ingredient_id, amount in amounts.items()),
+        default=Value(0), output_field=IntegerField()
+    ))
+    totals.filter(total_amount__lte=0).delete()
+
+
+def get_recipe_amounts(recipe):
+    return dict(IngredientInRecipe.objects.filter(
+        recipe=recipe).values_list('ingredient_id', 'amount'))
+
+
+def get_recipes_amounts(recipe_ids):
+    return dict(IngredientInRecipe.objects.filter(
+        recipe_id__in=recipe_ids
+    ).values_list('ingredient_id').annotate(Sum('amount')).order_by())
+
+
+def add_to_shopping_list_totals(author, recipe):
+    update_shopping_list_totals((author.pk,), get_recipe_amounts(recipe))
+
+
+def remove_from_shopping_list_totals(author_ids, recipe):
+    update_shopping_list_totals(
+        author_ids,
+        {ingredient_id: -amount
+         for ingredient_id, amount in get_recipe_amounts(recipe).items()}
+    )
+
+
+def change_recipe_in_shopping_lists(recipe, amounts):
+    author_ids = list(ShoppingList.objects.filter(
+        recipe=recipe).values_list('author_id', flat=True))
+    update_shopping_list_totals(author_ids, amounts)
+
+
+@contextmanager
+def track_recipe_amounts(recipe_ids):
+    before = {recipe_id: get_recipe_amounts(recipe_id)
+              for recipe_id in set(recipe_ids)}
+    yield
+    for recipe_id, amounts in before.items():
+        after = get_recipe_amounts(recipe_id)
+        change_recipe_in_shopping_lists(recipe_id, {
+            ingredient_id: (after.get(ingredient_id, 0)
+                            - amounts.get(ingredient_id, 0))
+            for ingredient_id in amounts.keys() | after.keys()
+        })
+
+
+def build_pdf(ingredients):
+    pdf = canvas.Canvas(io.BytesIO())
+    textobject = None
+    for name, unit, amount in ingredients:
+        if textobject is not None and textobject.getY() < BOTTOM:
+            pdf.drawText(textobject)
+            pdf.showPage()
+            textobject = None
+        if textobject is None:
+            textobject = pdf.beginText(inch, TOP)
+            textobject.setFont(FONT_NAME, FONT_SIZE)
+        textobject.textLine(f'{name}: {amount} {unit}')
+    if textobject is not None:
+        pdf.drawText(textobject)
+    pdf.showPage()
+    return pdf.getpdfdata()
+
+
+def get_shopping_list_pdf(ingredients):
+    digest = hashlib.sha256(repr(ingredients).encode()).hexdigest()
+    key = f'shopping_list_pdf:{digest}'
+    cache = caches[CACHE_ALIAS]
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = build_pdf(ingredients)
+        cache.set(key, pdf, CACHE_TIMEOUT)
+    return pdf
+
+
+def iter_chunks(data):
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start:start + CHUNK_SIZE]
@@ -0,0 +1,34 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .catalogue import bump_version
+from .ingredient_index import ingredient_index
+from .models import Ingredient, Recipe, ShoppingList, Tag
+from .recipe_index import record_recipe_changes
+from .shopping_list import remove_from_shopping_list_totals
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def invalidate_ingredient_index(**kwargs):
+    transaction.on_commit(ingredient_index.invalidate)
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def invalidate_tag_catalogue(**kwargs):
+    transaction.on_commit(lambda: bump_version('tags'))
+
+
+@receiver(pre_delete, sender=Recipe)
+def remove_recipe_from_shopping_lists(instance, **kwargs):
+    author_ids = list(ShoppingList.objects.filter(
+        recipe=instance).values_list('author_id', flat=True))
+    remove_from_shopping_list_totals(author_ids, instance)
+
+
+@receiver(pre_delete, sender=Recipe)
+def remove_recipe_from_index(instance, **kwargs):
+    record_recipe_changes(
+        instance.pk,
+        instance.ings_in_recipe.values_list('ingredient_id', flat=True)
+    )
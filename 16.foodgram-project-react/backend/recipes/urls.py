@@ -1,8 +1,11 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (DownloadShoppingList, FavouriteViewSet, IngredientViewSet,
-                    RecipeViewSet, ShoppingListViewSet, TagViewSet)
+from .async_views import (download_shopping_list, ingredient_list,
+                          recipe_list, tag_list)
+from .views import (FavouriteBatchView, FavouriteViewSet, IngredientViewSet,
+                    RecipeViewSet, ShoppingListBatchView, ShoppingListViewSet,
+                    TagViewSet)
 
 router_v1 = DefaultRouter()
 router_v1.register('recipes', RecipeViewSet, basename='recipes')
@@ -15,7 +18,14 @@ urlpatterns = [
          name='add_recipe_to_shopping_cart'),
     path('recipes/<int:recipe_id>/favorite/', FavouriteViewSet.as_view(),
          name='add_recipe_to_favorite'),
-    path('recipes/download_shopping_cart/', DownloadShoppingList.as_view(),
+    path('recipes/shopping_cart/', ShoppingListBatchView.as_view(),
+         name='batch_shopping_cart'),
+    path('recipes/favorite/', FavouriteBatchView.as_view(),
+         name='batch_favorite'),
+    path('recipes/download_shopping_cart/', download_shopping_list,
          name='download_shopping_list'),
+    path('recipes/', recipe_list, name='recipes-list'),
+    path('tags/', tag_list, name='tags-list'),
+    path('ingredients/', ingredient_list, name='ingredients-list'),
     path('', include(router_v1.urls)),
 ]
@@ -1,54 +1,109 @@
-import io
-
-from django.conf import settings
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.db.models.functions import Greatest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum
 from django_filters.rest_framework import DjangoFilterBackend
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab import rl_config
 from rest_framework import status, viewsets
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .filters import IngredientFilter, RecipeFilter
+from .catalogue import CatalogueMixin
+from .filters import IngredientFilter, RecipeFilter, RecipeOrderingFilter
+from .ingredient_index import ingredient_index
 from .models import (Favourite, Ingredient,
                      Recipe, ShoppingList, Tag)
-from .pagination import CustomPagination
+from .pagination import CustomPagination, RecipeCursorPagination
 from .permissions import IsAuthorOrAdminOrReadOnly
 from .serializer import (FavouriteSerializer, IngredientSerializer,
+                         RecipeBatchSerializer, RecipeMatchSerializer,
                          RecipeReadSerializer,
                          RecipeWriteSerializer,
                          ShoppingListSerializer, TagSerializer)
+from .recipe_index import recipe_index
+from .relations import UserRelations
+from .renderers import (CSVShoppingListRenderer, JSONShoppingListRenderer,
+                        PDFShoppingListRenderer, TextShoppingListRenderer)
+from .shopping_list import (add_to_shopping_list_totals,
+                            get_recipes_amounts, get_shopping_list,
+                            remove_from_shopping_list_totals,
+                            update_shopping_list_totals)
+from users.models import User
+
 
-rl_config.TTFSearchPath.append(str(settings.BASE_DIR) + '/fonts')
+def lock_author(author):
+    list(User.objects.select_for_update().filter(
+        pk=author.pk).values_list('pk', flat=True))
 
 
 class RecipeViewSet(viewsets.ModelViewSet):
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, RecipeOrderingFilter)
     filter_class = RecipeFilter
-    queryset = Recipe.objects.all()
+    ordering_fields = ('favorites_count', 'created')
+    ordering = ('-created', '-id')
     permission_classes = (IsAuthorOrAdminOrReadOnly,)
     pagination_class = CustomPagination
 
+    read_actions = ('list', 'retrieve', 'match')
+
+    @property
+    def paginator(self):
+        if (self.action == 'list'
+                and self.request.query_params.get('pagination') == 'cursor'):
+            self.pagination_class = RecipeCursorPagination
+        return super().paginator
+
+    def get_queryset(self):
+        if self.action in self.read_actions:
+            return Recipe.objects.for_read()
+        return Recipe.objects.all()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.read_actions and args:
+            recipes = args[0] if kwargs.get('many') else (args[0],)
+            kwargs['context'] = {
+                **self.get_serializer_context(),
+                'relations': UserRelations(self.request.user, recipes)
+            }
+        return super().get_serializer(*args, **kwargs)
+
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in self.read_actions:
             return RecipeReadSerializer
         return RecipeWriteSerializer
 
+    @action(detail=False)
+    def match(self, request):
+        serializer = RecipeMatchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        page = self.paginate_queryset(recipe_index.match(
+            serializer.validated_data['ingredients'],
+            serializer.validated_data['min_match']
+        ))
+        recipes = self.get_queryset().in_bulk(
+            [recipe_id for recipe_id, _ in page])
+        page = [(recipes[recipe_id], matched) for recipe_id, matched in page
+                if recipe_id in recipes]
+        serializer = self.get_serializer([recipe for recipe, _ in page],
+                                         many=True)
+        data = serializer.data
+        for recipe, (_, matched) in zip(data, page):
+            recipe['matched_ingredients'] = matched
+        return self.get_paginated_response(data)
+
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(CatalogueMixin, viewsets.ReadOnlyModelViewSet):
+    catalogue_name = 'tags'
     pagination_class = None
     permission_classes = (AllowAny,)
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(CatalogueMixin, viewsets.ReadOnlyModelViewSet):
+    catalogue_name = 'ingredients'
     filter_backends = (DjangoFilterBackend,)
     filter_class = IngredientFilter
     pagination_class = None
@@ -56,6 +111,14 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = IngredientSerializer
     queryset = Ingredient.objects.all()
 
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get('name')
+        if not name:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer(ingredient_index.search(name),
+                                         many=True)
+        return Response(serializer.data)
+
 
 class BaseCustomView(APIView):
     permission_classes = (IsAuthorOrAdminOrReadOnly,)
@@ -72,56 +135,174 @@ class BaseCustomView(APIView):
         serializer = self.serializer_to_use(data=data,
                                             context={'request': request})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete(self, request, recipe_id):
         author = request.user
         recipe = get_object_or_404(Recipe, pk=recipe_id)
-        rec_exists = self.model_contains.objects.filter(author=author,
-                                                        recipe=recipe).delete()
-        if rec_exists[0] == 0:
+        if not self.perform_destroy(author, recipe):
             return Response(self.error_message,
                             status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def perform_create(self, serializer):
+        serializer.save()
+
+    def perform_destroy(self, author, recipe):
+        lock_author(author)
+        deleted, _ = self.model_contains.objects.filter(
+            author=author, recipe=recipe).delete()
+        return deleted
+
 
 class ShoppingListViewSet(BaseCustomView):
     error_message = 'Данного рецепта нет в Вашем списке покупок'
     serializer_to_use = ShoppingListSerializer
     model_contains = ShoppingList
 
+    @transaction.atomic
+    def perform_create(self, serializer):
+        lock_author(serializer.validated_data['author'])
+        shopping_list = serializer.save()
+        add_to_shopping_list_totals(shopping_list.author,
+                                    shopping_list.recipe)
+
+    @transaction.atomic
+    def perform_destroy(self, author, recipe):
+        deleted = super().perform_destroy(author, recipe)
+        if deleted:
+            remove_from_shopping_list_totals((author.pk,), recipe)
+        return deleted
+
 
 class FavouriteViewSet(BaseCustomView):
     error_message = 'Данного рецепта нет в Избранном'
     serializer_to_use = FavouriteSerializer
     model_contains = Favourite
 
+    @transaction.atomic
+    def perform_create(self, serializer):
+        lock_author(serializer.validated_data['author'])
+        favourite = serializer.save()
+        Recipe.objects.filter(pk=favourite.recipe_id).update(
+            favorites_count=F('favorites_count') + 1)
+
+    @transaction.atomic
+    def perform_destroy(self, author, recipe):
+        deleted = super().perform_destroy(author, recipe)
+        if deleted:
+            Recipe.objects.filter(pk=recipe.pk).update(
+                favorites_count=Greatest(F('favorites_count') - deleted, 0))
+        return deleted
+
+
+class BaseBatchView(APIView):
+    permission_classes = (IsAuthenticated,)
+    model_contains = None
+
+    def get_recipe_ids(self, request):
+        serializer = RecipeBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return list(dict.fromkeys(serializer.validated_data['recipes']))
+
+    def get_contained(self, author, recipe_ids):
+        return dict(Recipe.objects.filter(pk__in=recipe_ids).annotate(
+            contained=Exists(self.model_contains.objects.filter(
+                author=author, recipe=OuterRef('pk')))
+        ).values_list('pk', 'contained').order_by())
+
+    def get_results(self, recipe_ids, contained, changed, status_changed,
+                    status_unchanged):
+        results = []
+        for recipe_id in recipe_ids:
+            if recipe_id not in contained:
+                item_status = 'not_found'
+            elif recipe_id in changed:
+                item_status = status_changed
+            else:
+                item_status = status_unchanged
+            results.append({'id': recipe_id, 'status': item_status})
+        return Response({'results': results})
+
+    @transaction.atomic
+    def post(self, request):
+        author = request.user
+        recipe_ids = self.get_recipe_ids(request)
+        lock_author(author)
+        contained = self.get_contained(author, recipe_ids)
+        added = [recipe_id for recipe_id in recipe_ids
+                 if recipe_id in contained and not contained[recipe_id]]
+        self.model_contains.objects.bulk_create(
+            (self.model_contains(author=author, recipe_id=recipe_id)
+             for recipe_id in added),
+            ignore_conflicts=True
+        )
+        self.perform_batch_create(author, added)
+        return self.get_results(recipe_ids, contained, set(added),
+                                'added', 'exists')
+
+    @transaction.atomic
+    def delete(self, request):
+        author = request.user
+        recipe_ids = self.get_recipe_ids(request)
+        lock_author(author)
+        contained = self.get_contained(author, recipe_ids)
+        removed = [recipe_id for recipe_id in recipe_ids
+                   if contained.get(recipe_id)]
+        self.model_contains.objects.filter(
+            author=author, recipe_id__in=removed).delete()
+        self.perform_batch_destroy(author, removed)
+        return self.get_results(recipe_ids, contained, set(removed),
+                                'removed', 'absent')
+
+    def perform_batch_create(self, author, recipe_ids):
+        pass
+
+    def perform_batch_destroy(self, author, recipe_ids):
+        pass
+
+
+class ShoppingListBatchView(BaseBatchView):
+    model_contains = ShoppingList
+
+    def perform_batch_create(self, author, recipe_ids):
+        update_shopping_list_totals((author.pk,),
+                                    get_recipes_amounts(recipe_ids))
+
+    def perform_batch_destroy(self, author, recipe_ids):
+        update_shopping_list_totals(
+            (author.pk,),
+            {ingredient_id: -amount for ingredient_id, amount
+             in get_recipes_amounts(recipe_ids).items()}
+        )
+
+
+class FavouriteBatchView(BaseBatchView):
+    model_contains = Favourite
+
+    def perform_batch_create(self, author, recipe_ids):
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            favorites_count=F('favorites_count') + 1)
+
+    def perform_batch_destroy(self, author, recipe_ids):
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            favorites_count=Greatest(F('favorites_count') - 1, 0))
+
 
 class DownloadShoppingList(APIView):
     permission_classes = (IsAuthorOrAdminOrReadOnly,)
+    renderer_classes = (PDFShoppingListRenderer, TextShoppingListRenderer,
+                        CSVShoppingListRenderer, JSONShoppingListRenderer)
 
     def get(self, request):
-        recipes = Recipe.objects.filter(shop_recipes__author=request.user.pk)
-        ingredients = recipes.values_list(
-            'ingredients__name',
-            'ingredients__measurement_unit'
-        ).annotate(ingredients_amount=Sum('ings_in_recipe__amount'))
-        response = HttpResponse(content_type='application/pdf; charset=UTF-8')
-        response['Content-Disposition'] = 'attachment; filename="spisok.pdf"'
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer)
-        textobject = p.beginText()
-        textobject.setTextOrigin(inch, 10.5 * inch)
-        pdfmetrics.registerFont(TTFont('Roboto', 'Roboto-Regular.ttf'))
-        textobject.setFont('Roboto', 14)
-        for ingr in ingredients:
-            stroka = f'{ingr[0]}: {ingr[2]} {ingr[1]}'
-            textobject.textLine(stroka)
-        p.drawText(textobject)
-        p.showPage()
-        p.save()
-        pdf = buffer.getvalue()
-        buffer.close()
-        response.write(pdf)
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(
+            renderer.stream(get_shopping_list(request.user)),
+            content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="spisok.{renderer.format}"')
         return response
@@ -0,0 +1,4 @@
+pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_recipe',
+]
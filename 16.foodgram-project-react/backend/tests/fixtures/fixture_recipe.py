@@ -0,0 +1,62 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.conf import settings
+    from django.core.cache import caches
+
+    from recipes.catalogue import forget_versions
+    from recipes.ingredient_index import ingredient_index
+    from recipes.recipe_index import recipe_index
+
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    forget_versions()
+    ingredient_index.invalidate()
+    recipe_index.invalidate()
+
+
+@pytest.fixture
+def tags():
+    from recipes.models import Tag
+
+    return [
+        Tag.objects.create(name=name, hex_code=hex_code, slug=slug)
+        for name, hex_code, slug in (('Завтрак', '#E26C2D', 'breakfast'),
+                                     ('Обед', '#49B64E', 'lunch'),
+                                     ('Ужин', '#8775D2', 'dinner'))
+    ]
+
+
+@pytest.fixture
+def ingredients():
+    from recipes.models import Ingredient
+
+    return [
+        Ingredient.objects.create(name=name, measurement_unit=unit)
+        for name, unit in (('мука', 'г'), ('молоко', 'мл'), ('яйца', 'шт'),
+                           ('сахар', 'г'), ('соль', 'г'))
+    ]
+
+
+@pytest.fixture
+def recipes(user, another_user, tags, ingredients):
+    from recipes.models import IngredientInRecipe, Recipe
+
+    recipes = []
+    for index in range(6):
+        recipe = Recipe.objects.create(
+            author=(user, another_user)[index % 2],
+            name=f'Рецепт {index}', image='recipes/test.jpg',
+            text='Описание', cooking_time=10 + index
+        )
+        recipe.tags.set(tags[:1 + index % 3])
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(recipe=recipe,
+                               ingredient=ingredients[(index + shift) % 5],
+                               amount=100 * (shift + 1))
+            for shift in range(3)
+        )
+        recipes.append(recipe)
+    return recipes
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        email='user@foodgram.fake', username='TestUser',
+        first_name='Иван', last_name='Иванов', password='1234567'
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        email='another@foodgram.fake', username='AnotherUser',
+        first_name='Пётр', last_name='Петров', password='1234567'
+    )
+
+
+@pytest.fixture
+def user_client(user):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def guest_client():
+    from rest_framework.test import APIClient
+
+    return APIClient()
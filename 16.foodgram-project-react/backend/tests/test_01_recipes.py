@@ -0,0 +1,133 @@
+import pytest
+
+
+class Test01RecipesAPI:
+
+    def create_more_recipes(self, author, count):
+        from recipes.models import IngredientInRecipe, Ingredient, Recipe, Tag
+
+        ingredient = Ingredient.objects.first()
+        for index in range(count):
+            recipe = Recipe.objects.create(
+                author=author, name=f'Новый рецепт {index}',
+                image='recipes/test.jpg', text='Описание', cooking_time=5
+            )
+            recipe.tags.set(Tag.objects.all())
+            IngredientInRecipe.objects.create(recipe=recipe,
+                                              ingredient=ingredient,
+                                              amount=50)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_queries(self, user, user_client, guest_client, recipes,
+                             django_assert_num_queries):
+        with django_assert_num_queries(4):
+            response = guest_client.get('/api/recipes/')
+        assert response.status_code == 200
+        with django_assert_num_queries(7):
+            response = user_client.get('/api/recipes/')
+        assert response.status_code == 200
+        self.create_more_recipes(user, 6)
+        with django_assert_num_queries(4):
+            guest_client.get('/api/recipes/?limit=12')
+        with django_assert_num_queries(7):
+            response = user_client.get('/api/recipes/?limit=12')
+        assert len(response.json()['results']) == 12, (
+            'Проверьте, что при GET запросе `/api/recipes/` количество '
+            'запросов к базе не зависит от количества рецептов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retrieve_queries(self, user_client, guest_client, recipes,
+                                 django_assert_num_queries):
+        url = f'/api/recipes/{recipes[0].id}/'
+        with django_assert_num_queries(3):
+            response = guest_client.get(url)
+        assert response.status_code == 200
+        with django_assert_num_queries(6):
+            response = user_client.get(url)
+        data = response.json()
+        assert len(data['ingredients']) == 3 and len(data['tags']) == 1, (
+            'Проверьте, что при GET запросе `/api/recipes/{id}/` теги и '
+            'ингредиенты загружаются вместе с рецептом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_user_flags(self, user, user_client, guest_client, recipes):
+        from recipes.models import Favourite, ShoppingList
+
+        Favourite.objects.create(author=user, recipe=recipes[0])
+        ShoppingList.objects.create(author=user, recipe=recipes[1])
+        response = user_client.get('/api/recipes/?limit=10')
+        assert response.status_code == 200
+        flags = {recipe['id']: (recipe['is_favorited'],
+                                recipe['is_in_shopping_cart'])
+                 for recipe in response.json()['results']}
+        assert flags[recipes[0].id] == (True, False), (
+            'Проверьте, что поле `is_favorited` равно True для рецептов '
+            'из избранного пользователя'
+        )
+        assert flags[recipes[1].id] == (False, True), (
+            'Проверьте, что поле `is_in_shopping_cart` равно True для '
+            'рецептов из списка покупок пользователя'
+        )
+        assert flags[recipes[2].id] == (False, False)
+        response = guest_client.get('/api/recipes/?limit=10')
+        assert not any(recipe['is_favorited'] or recipe['is_in_shopping_cart']
+                       for recipe in response.json()['results']), (
+            'Проверьте, что для анонимного пользователя поля `is_favorited` '
+            'и `is_in_shopping_cart` равны False'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_unchanged_patch_writes(self, another_user, recipes):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIClient
+
+        from recipes.models import Recipe
+
+        recipe = recipes[1]
+        client = APIClient()
+        client.force_authenticate(another_user)
+        data = {
+            'ingredients': [
+                {'id': ing_in_recipe.ingredient_id,
+                 'amount': ing_in_recipe.amount}
+                for ing_in_recipe in recipe.ings_in_recipe.all()
+            ],
+            'tags': [tag.id for tag in recipe.tags.all()],
+            'name': recipe.name,
+            'text': recipe.text,
+            'cooking_time': recipe.cooking_time,
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = client.patch(f'/api/recipes/{recipe.id}/', data=data,
+                                    format='json')
+        assert response.status_code == 200
+        writes = [query['sql'] for query in context.captured_queries
+                  if query['sql'].split(' ', 1)[0] in (
+                      'INSERT', 'UPDATE', 'DELETE')]
+        assert len(writes) == 1 and writes[0].startswith(
+            f'UPDATE "{Recipe._meta.db_table}"'), (
+            'Проверьте, что PATCH запрос без изменений ингредиентов и '
+            'тегов записывает в базу только строку рецепта'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_write_benchmark_command(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from recipes.models import Recipe
+
+        out = StringIO()
+        call_command('benchmark_recipe_write', '--ingredients', '6',
+                     '--repeat', '2', stdout=out)
+        assert [line.split(':')[0] for line in out.getvalue().splitlines()
+                ] == ['без изменений', 'изменено количество',
+                      'заменена половина ингредиентов']
+        assert not Recipe.objects.exists(), (
+            'Проверьте, что benchmark_recipe_write откатывает '
+            'временные данные'
+        )
@@ -0,0 +1,35 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test02RecipeFiltersAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_filter_plans(self, user, recipes):
+        from django.db import connection, transaction
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            call_command('explain_recipe_filters', user=user.id)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_tags_filter(self, guest_client, recipes):
+        from recipes.models import Tag
+
+        response = guest_client.get('/api/recipes/?tags=dinner&limit=10')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что фильтр `tags` оставляет рецепты с указанным тегом'
+        )
+        tag = Tag.objects.create(name='Десерт', hex_code='#FFFFFF',
+                                 slug='dessert')
+        recipes[0].tags.add(tag)
+        response = guest_client.get(
+            '/api/recipes/?tags=dinner&tags=dessert&limit=10')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что фильтр `tags` учитывает только что созданные '
+            'теги и объединяет несколько тегов через ИЛИ'
+        )
+        response = guest_client.get('/api/recipes/?tags=unknown')
+        assert response.json()['count'] == 0
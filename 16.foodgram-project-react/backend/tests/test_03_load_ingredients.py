@@ -0,0 +1,78 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+class Test03LoadIngredients:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_csv(self, tmp_path):
+        from recipes.models import Ingredient
+
+        path = tmp_path / 'ingredients.csv'
+        path.write_text('name,measurement_unit\nмука,г\nмолоко,мл\nмука,г\n',
+                        encoding='utf-8')
+        call_command('load_ingredients', str(path))
+        loaded = set(Ingredient.objects.values_list('name',
+                                                    'measurement_unit'))
+        assert loaded == {('мука', 'г'), ('молоко', 'мл')}, (
+            'Проверьте, что команда `load_ingredients` загружает ингредиенты '
+            'из CSV-файла и пропускает дубликаты'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_short_row(self, tmp_path):
+        from recipes.models import Ingredient
+
+        path = tmp_path / 'ingredients.csv'
+        path.write_text('мука,г\nмолоко\nсоль,г\n', encoding='utf-8')
+        with pytest.raises(CommandError, match='Строка 2'):
+            call_command('load_ingredients', str(path))
+        assert not Ingredient.objects.exists(), (
+            'Проверьте, что при ошибке в файле команда `load_ingredients` '
+            'не загружает ни одной строки'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_load_json(self, tmp_path, monkeypatch):
+        import json
+
+        from recipes.management.commands import load_ingredients
+        from recipes.models import Ingredient
+
+        monkeypatch.setattr(load_ingredients.iter_json_objects,
+                            '__defaults__', (8,))
+        items = [{'name': 'мука', 'measurement_unit': 'г'},
+                 {'name': 'молоко', 'measurement_unit': 'мл'}]
+        array_path = tmp_path / 'ingredients.json'
+        array_path.write_text(json.dumps(items, ensure_ascii=False),
+                              encoding='utf-8')
+        lines_path = tmp_path / 'more.json'
+        lines_path.write_text(
+            json.dumps({'name': 'соль', 'measurement_unit': 'г'},
+                       ensure_ascii=False) + '\n', encoding='utf-8')
+        call_command('load_ingredients', str(array_path))
+        call_command('load_ingredients', str(lines_path))
+        loaded = set(Ingredient.objects.values_list('name',
+                                                    'measurement_unit'))
+        assert loaded == {('мука', 'г'), ('молоко', 'мл'), ('соль', 'г')}, (
+            'Проверьте, что команда `load_ingredients` читает JSON-массив '
+            'и JSON Lines по частям'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_malformed_json(self, tmp_path):
+        from recipes.models import Ingredient
+
+        path = tmp_path / 'ingredients.json'
+        for content in ('[{"name": "мука", "measurement_unit": "г"}, '
+                        '{"name": "соль"}]',
+                        '[{"name": "мука", "measurement_unit": "г"}, '
+                        '{"name": 1, "measurement_unit": "г"}]'):
+            path.write_text(content, encoding='utf-8')
+            with pytest.raises(CommandError, match='Запись 2'):
+                call_command('load_ingredients', str(path))
+        assert not Ingredient.objects.exists(), (
+            'Проверьте, что при ошибке в JSON-записи команда '
+            '`load_ingredients` сообщает номер записи и не загружает '
+            'ни одной строки'
+        )
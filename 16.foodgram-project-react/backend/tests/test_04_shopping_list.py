@@ -0,0 +1,114 @@
+import pytest
+
+
+class Test04ShoppingListTotals:
+
+    def assert_totals(self, message):
+        from recipes.models import ShoppingListIngredient
+        from recipes.shopping_list import calculate_shopping_list_totals
+
+        stored = {(total.author_id, total.ingredient_id): total.total_amount
+                  for total in ShoppingListIngredient.objects.all()}
+        assert stored == calculate_shopping_list_totals(), message
+
+    def get_admin(self, model):
+        from django.contrib import admin
+
+        return admin.site._registry[model]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cart_and_recipe_update(self, user, user_client,
+                                       another_user, recipes, ingredients,
+                                       tags):
+        from rest_framework.test import APIClient
+
+        for recipe in recipes[:3]:
+            user_client.get(f'/api/recipes/{recipe.id}/shopping_cart/')
+        another_client = APIClient()
+        another_client.force_authenticate(another_user)
+        another_client.get(f'/api/recipes/{recipes[1].id}/shopping_cart/')
+        self.assert_totals(
+            'Проверьте, что при добавлении рецепта в список покупок '
+            'обновляются сохранённые суммы ингредиентов'
+        )
+        response = another_client.patch(
+            f'/api/recipes/{recipes[1].id}/',
+            data={'ingredients': [{'id': ingredients[0].id, 'amount': 5},
+                                  {'id': ingredients[2].id, 'amount': 700}],
+                  'tags': [tags[0].id], 'cooking_time': 5},
+            format='json'
+        )
+        assert response.status_code == 200
+        self.assert_totals(
+            'Проверьте, что при изменении ингредиентов рецепта '
+            'обновляются суммы во всех списках покупок с этим рецептом'
+        )
+        user_client.delete(f'/api/recipes/{recipes[0].id}/shopping_cart/')
+        self.assert_totals(
+            'Проверьте, что при удалении рецепта из списка покупок '
+            'суммы ингредиентов уменьшаются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_admin_changes(self, user, recipes, ingredients, rf):
+        from recipes.models import IngredientInRecipe, ShoppingList
+        from recipes.shopping_list import add_to_shopping_list_totals
+
+        for recipe in recipes[:2]:
+            ShoppingList.objects.create(author=user, recipe=recipe)
+            add_to_shopping_list_totals(user, recipe)
+        model_admin = self.get_admin(IngredientInRecipe)
+        request = rf.post('/admin/')
+        ing_in_recipe = recipes[0].ings_in_recipe.first()
+        ing_in_recipe.amount += 50
+        model_admin.save_model(request, ing_in_recipe, None, True)
+        self.assert_totals(
+            'Проверьте, что изменение количества ингредиента в админке '
+            'обновляет суммы в списках покупок'
+        )
+        ing_in_recipe.recipe = recipes[2]
+        model_admin.save_model(request, ing_in_recipe, None, True)
+        self.assert_totals(
+            'Проверьте, что перенос ингредиента в другой рецепт в админке '
+            'обновляет суммы в списках покупок'
+        )
+        model_admin.save_model(request, IngredientInRecipe(
+            recipe=recipes[1], ingredient=ingredients[4], amount=30
+        ), None, False)
+        model_admin.delete_model(request, recipes[1].ings_in_recipe.first())
+        self.assert_totals(
+            'Проверьте, что добавление и удаление ингредиента в админке '
+            'обновляет суммы в списках покупок'
+        )
+        model_admin.delete_queryset(request, IngredientInRecipe.objects.all())
+        self.assert_totals(
+            'Проверьте, что массовое удаление ингредиентов в админке '
+            'обновляет суммы в списках покупок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild_after_loaddata(self, user, user_client, recipes):
+        from django.core.management import call_command
+
+        from recipes.models import ShoppingList
+
+        ShoppingList.objects.bulk_create(
+            ShoppingList(author=user, recipe=recipe) for recipe in recipes[:2]
+        )
+        response = user_client.get(
+            '/api/recipes/download_shopping_cart/?format=txt')
+        assert b''.join(response.streaming_content).strip() == b'', (
+            'Суммы ингредиентов не пересчитываются при загрузке фикстур, '
+            'до запуска check_shopping_lists --fix список пуст'
+        )
+        call_command('check_shopping_lists', '--fix')
+        self.assert_totals(
+            'Проверьте, что `check_shopping_lists --fix` пересобирает суммы '
+            'ингредиентов для корзин, загруженных фикстурами'
+        )
+        response = user_client.get(
+            '/api/recipes/download_shopping_cart/?format=txt')
+        content = b''.join(response.streaming_content).decode()
+        for recipe in recipes[:2]:
+            for ing_in_recipe in recipe.ings_in_recipe.all():
+                assert ing_in_recipe.ingredient.name in content
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class Test05SubscriptionsAPI:
+
+    def create_authors(self, django_user_model, user, count):
+        from recipes.models import Recipe
+        from users.models import Subscribe
+
+        authors = []
+        for index in range(count):
+            author = django_user_model.objects.create_user(
+                email=f'author{index}@foodgram.fake',
+                username=f'Author{index}', first_name='Автор',
+                last_name=str(index), password='1234567'
+            )
+            Subscribe.objects.create(user=user, following=author)
+            for number in range(3):
+                Recipe.objects.create(
+                    author=author, name=f'Рецепт {index}.{number}',
+                    image='recipes/test.jpg', text='Описание',
+                    cooking_time=5
+                )
+            authors.append(author)
+        return authors
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_recipes_limit(self, django_user_model, user, user_client,
+                              django_assert_num_queries):
+        from recipes.models import Recipe
+
+        authors = self.create_authors(django_user_model, user, 4)
+        with django_assert_num_queries(3):
+            response = user_client.get(
+                '/api/users/subscriptions/?limit=2&recipes_limit=2')
+        data = response.json()
+        assert data['count'] == 4
+        for author, result in zip(authors, data['results']):
+            latest = list(Recipe.objects.filter(author=author).order_by(
+                '-created', '-id').values_list('id', flat=True)[:2])
+            assert [recipe['id'] for recipe in result['recipes']] == latest, (
+                'Проверьте, что параметр `recipes_limit` оставляет последние '
+                'рецепты каждого автора'
+            )
+            assert result['recipes_count'] == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recipes_limit_ranks_page_authors(self, django_user_model,
+                                                 user, user_client):
+        self.create_authors(django_user_model, user, 4)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(
+                '/api/users/subscriptions/?limit=1&recipes_limit=1')
+        ranking = [query['sql'] for query in context.captured_queries
+                   if 'FROM "recipes_recipe" WHERE' in query['sql']
+                   and 'LIMIT 1' in query['sql']]
+        assert len(ranking) == 1
+        assert 'users_subscribe' not in ranking[0], (
+            'Проверьте, что при `recipes_limit` ранжируются только рецепты '
+            'авторов текущей страницы'
+        )
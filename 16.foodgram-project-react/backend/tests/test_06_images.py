@@ -0,0 +1,181 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+
+class Test06RecipeImages:
+
+    def create_recipe(self, user):
+        from django.core.files.base import ContentFile
+        from PIL import Image
+
+        from recipes.models import Recipe
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), 'red').save(buffer, 'JPEG')
+        recipe = Recipe(author=user, name='Рецепт', text='Описание',
+                        cooking_time=5)
+        recipe.image.save('photo.jpg', ContentFile(buffer.getvalue()),
+                          save=False)
+        recipe.save()
+        return recipe
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_renditions_ready(self, settings, tmp_path, user, guest_client,
+                                 monkeypatch):
+        from django.core.files.storage import default_storage
+
+        from recipes.images import RENDITIONS, save_renditions
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        recipe = self.create_recipe(user)
+
+        def fail(name):
+            raise AssertionError(name)
+
+        monkeypatch.setattr(default_storage, 'exists', fail)
+        response = guest_client.get(f'/api/recipes/{recipe.id}/')
+        images = response.json()['images']
+        original = recipe.image.url
+        assert all(url.endswith(original) for url in images.values()), (
+            'Проверьте, что пока копии изображения не готовы, `images` '
+            'ссылается на исходное изображение'
+        )
+        monkeypatch.undo()
+        assert save_renditions(recipe.id, recipe.image.name)
+        monkeypatch.setattr(default_storage, 'exists', fail)
+        response = guest_client.get(f'/api/recipes/{recipe.id}/')
+        images = response.json()['images']
+        assert set(images) == set(RENDITIONS)
+        assert all(url.endswith(f'_{rendition}.jpg')
+                   for rendition, url in images.items()), (
+            'Проверьте, что после подготовки копий `images` ссылается на них '
+            'без обращения к хранилищу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_make_renditions(self, settings, tmp_path, user):
+        from recipes.images import RENDITIONS, get_rendition_name
+        from recipes.models import Recipe
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        recipe = self.create_recipe(user)
+        call_command('make_renditions')
+        recipe = Recipe.objects.get(pk=recipe.pk)
+        assert recipe.renditions_ready, (
+            'Проверьте, что команда `make_renditions` готовит копии '
+            'изображений рецептов, для которых их ещё нет'
+        )
+        for rendition in RENDITIONS:
+            name = get_rendition_name(recipe.image.name, rendition)
+            assert (tmp_path / name).is_file()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_upload_processed_in_background(self, settings, tmp_path,
+                                               user_client, ingredients,
+                                               tags, monkeypatch):
+        import base64
+        import threading
+
+        from PIL import Image
+
+        from recipes import images
+        from recipes.models import Recipe
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        threads = []
+        to_rgb = images.to_rgb
+        monkeypatch.setattr(images, 'to_rgb', lambda image: threads.append(
+            threading.current_thread().name) or to_rgb(image))
+        buffer = io.BytesIO()
+        Image.new('RGBA', (3000, 1000), (255, 0, 0, 128)).save(buffer, 'PNG')
+        response = user_client.post('/api/recipes/', data={
+            'ingredients': [{'id': ingredients[0].id, 'amount': 10}],
+            'tags': [tags[0].id],
+            'image': ('data:image/png;base64,'
+                      + base64.b64encode(buffer.getvalue()).decode()),
+            'name': 'Рецепт', 'text': 'Описание', 'cooking_time': 5,
+        }, format='json')
+        assert response.status_code == 201, response.json()
+        images.wait_for_renditions()
+        assert threads and all(name.startswith('recipe-images')
+                               for name in threads), (
+            'Проверьте, что изображение декодируется и уменьшается в фоне, '
+            'а не в потоке запроса'
+        )
+        recipe = Recipe.objects.get(pk=response.json()['id'])
+        assert recipe.renditions_ready and recipe.image.name.endswith('.jpg')
+        with Image.open(recipe.image.path) as image:
+            assert (image.format, image.size) == ('JPEG', (1920, 640)), (
+                'Проверьте, что загруженное изображение приводится к JPEG '
+                'не больше 1920 пикселей по большей стороне'
+            )
+        assert [path.suffix for path in (tmp_path / 'recipes').iterdir()
+                if '_' not in path.stem] == ['.jpg'], (
+            'Проверьте, что исходный файл удаляется после обработки'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_invalid_upload(self, user_client, ingredients, tags):
+        import base64
+
+        response = user_client.post('/api/recipes/', data={
+            'ingredients': [{'id': ingredients[0].id, 'amount': 10}],
+            'tags': [tags[0].id],
+            'image': base64.b64encode(b'not an image').decode(),
+            'name': 'Рецепт', 'text': 'Описание', 'cooking_time': 5,
+        }, format='json')
+        assert response.status_code == 400 and 'image' in response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_truncated_upload(self, user_client, ingredients, tags):
+        import base64
+
+        from PIL import Image
+
+        from recipes.models import Recipe
+
+        buffer = io.BytesIO()
+        Image.effect_noise((800, 600), 64).convert('RGB').save(buffer, 'JPEG')
+        truncated = buffer.getvalue()[:len(buffer.getvalue()) // 2]
+        response = user_client.post('/api/recipes/', data={
+            'ingredients': [{'id': ingredients[0].id, 'amount': 10}],
+            'tags': [tags[0].id],
+            'image': base64.b64encode(truncated).decode(),
+            'name': 'Рецепт', 'text': 'Описание', 'cooking_time': 5,
+        }, format='json')
+        assert response.status_code == 400 and 'image' in response.json(), (
+            'Проверьте, что изображение, которое не удаётся декодировать, '
+            'отклоняется до сохранения рецепта'
+        )
+        assert not Recipe.objects.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_renditions_of_deleted_recipe(self, settings, tmp_path, user,
+                                             monkeypatch):
+        from recipes import images
+        from recipes.models import Recipe
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        names = []
+        recipe = self.create_recipe(user)
+        names.append(recipe.image.name)
+        Recipe.objects.filter(pk=recipe.pk).delete()
+        assert not images.save_renditions(recipe.pk, recipe.image.name)
+        recipe = self.create_recipe(user)
+        names.append(recipe.image.name)
+        encode = images.encode
+
+        def delete_and_encode(image):
+            Recipe.objects.filter(pk=recipe.pk).delete()
+            return encode(image)
+
+        monkeypatch.setattr(images, 'encode', delete_and_encode)
+        assert not images.save_renditions(recipe.pk, recipe.image.name)
+        assert not any((tmp_path / images.get_rendition_name(name, rendition))
+                       .exists()
+                       for name in names for rendition in images.RENDITIONS), (
+            'Проверьте, что копии изображения удалённого рецепта '
+            'не сохраняются'
+        )
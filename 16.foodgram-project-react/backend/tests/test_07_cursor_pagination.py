@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class Test07CursorPagination:
+
+    def walk(self, client, url, key):
+        ids = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                data = client.get(url).json()
+            assert not any('OFFSET' in query['sql'].upper()
+                           for query in context.captured_queries), (
+                'Проверьте, что курсорная пагинация не использует OFFSET'
+            )
+            ids.extend(recipe['id'] for recipe in data['results'])
+            url = data[key]
+        return ids
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('ordering', ('', '-favorites_count',
+                                          'favorites_count'))
+    def test_01_walk_pages(self, guest_client, recipes, ordering):
+        from recipes.models import Recipe
+
+        Recipe.objects.filter(pk__in=[recipe.pk for recipe in recipes[:4]]
+                              ).update(favorites_count=2)
+        expected = list(Recipe.objects.order_by(
+            *((ordering,) if ordering else ()), '-created', '-id'
+        ).values_list('id', flat=True))
+        url = f'/api/recipes/?pagination=cursor&limit=2&ordering={ordering}'
+        forward = self.walk(guest_client, url, 'next')
+        assert forward == expected, (
+            'Проверьте, что курсорная пагинация обходит все рецепты по '
+            'порядку без пропусков и повторов, в том числе при равных '
+            'значениях поля сортировки'
+        )
+        last_page = guest_client.get(url).json()
+        while last_page['next']:
+            last_page = guest_client.get(last_page['next']).json()
+        backward = self.walk(guest_client, last_page['previous'], 'previous')
+        last_ids = [recipe['id'] for recipe in last_page['results']]
+        assert set(backward) == set(expected) - set(last_ids), (
+            'Проверьте, что по ссылкам `previous` курсорная пагинация '
+            'возвращает все предыдущие рецепты'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalid_cursor(self, guest_client, recipes):
+        response = guest_client.get(
+            '/api/recipes/?pagination=cursor'
+            '&cursor=cD0lNUIlMjJ4JTIyJTJDKyUyMnklMjIlNUQ%3D')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_benchmark_command(self, recipes):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from recipes.models import Recipe
+
+        out = StringIO()
+        call_command('benchmark_recipe_pagination', '--recipes', '200',
+                     '--repeat', '1', stdout=out)
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 12 and lines[0].endswith('206'), (
+            'Проверьте, что benchmark_recipe_pagination сравнивает '
+            'страницы на каждой глубине для обеих сортировок'
+        )
+        assert Recipe.objects.count() == len(recipes)
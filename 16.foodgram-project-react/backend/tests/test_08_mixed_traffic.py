@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test08MixedTraffic:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_benchmark(self, settings, tmp_path, live_server, recipes,
+                          capsys):
+        from recipes.images import wait_for_renditions
+        from recipes.models import Recipe
+        from users.models import User
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        count = Recipe.objects.count()
+        call_command('benchmark_mixed_traffic', live_server.url, requests=6,
+                     concurrency=1, cart=2)
+        wait_for_renditions()
+        output = capsys.readouterr().out
+        assert 'запросов/с' in output
+        assert 'ошибкой' not in output, output
+        assert Recipe.objects.count() == count, (
+            'Проверьте, что `benchmark_mixed_traffic` удаляет созданные '
+            'рецепты'
+        )
+        assert not User.objects.filter(username='benchmark_traffic').exists()
+        assert not list((tmp_path / 'recipes').glob('*_*.jpg')), (
+            'Проверьте, что после `benchmark_mixed_traffic` не остаются '
+            'копии изображений удалённых рецептов'
+        )
+
+    def asgi_get(self, path, query_string=b'', headers=()):
+        from asgiref.sync import async_to_sync
+
+        from foodgram.asgi import application
+
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(application)({
+            'type': 'http', 'asgi': {'version': '3.0'},
+            'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'root_path': '',
+            'query_string': query_string,
+            'headers': [(b'host', b'localhost'), *headers],
+            'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+        }, receive, send)
+        return messages[0]['status'], b''.join(
+            message.get('body', b'') for message in messages[1:])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_asgi_views(self, user, tags, monkeypatch):
+        import json
+        import threading
+
+        from rest_framework.authtoken.models import Token
+
+        from recipes import views
+        from recipes.models import Ingredient, ShoppingListIngredient
+
+        ingredient = Ingredient.objects.create(name='Соль',
+                                               measurement_unit='г')
+        ShoppingListIngredient.objects.create(author=user,
+                                              ingredient=ingredient,
+                                              total_amount=5)
+        token = Token.objects.create(user=user).key
+        threads = []
+        get_shopping_list = views.get_shopping_list
+        monkeypatch.setattr(views, 'get_shopping_list', lambda author: (
+            threads.append(threading.current_thread().name)
+            or get_shopping_list(author)))
+        status, content = self.asgi_get(
+            '/api/recipes/download_shopping_cart/', b'format=txt',
+            [(b'authorization', f'Token {token}'.encode())])
+        assert (status, content.decode()) == (200, 'Соль: 5 г\n'), (
+            'Проверьте, что список покупок выгружается через ASGI'
+        )
+        assert threads and all(name.startswith('foodgram-views')
+                               for name in threads), (
+            'Проверьте, что при запуске через ASGI синхронная работа с БД '
+            'выполняется в ограниченном пуле потоков'
+        )
+        status, content = self.asgi_get('/api/tags/')
+        assert status == 200
+        assert sorted(tag['id'] for tag in json.loads(content)) == sorted(
+            tag.id for tag in tags)
@@ -0,0 +1,115 @@
+import pytest
+
+
+class Test09BatchAPI:
+
+    def get_favorites_counts(self, recipes):
+        from recipes.models import Recipe
+
+        return dict(Recipe.objects.filter(
+            pk__in=[recipe.pk for recipe in recipes]
+        ).values_list('pk', 'favorites_count'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_batch_favorites(self, user_client, recipes):
+        ids = [recipes[0].id, recipes[1].id]
+        response = user_client.post('/api/recipes/favorite/',
+                                    data={'recipes': [*ids, 999999]},
+                                    format='json')
+        assert response.status_code == 200
+        assert [item['status'] for item in response.json()['results']] == [
+            'added', 'added', 'not_found']
+        response = user_client.post('/api/recipes/favorite/',
+                                    data={'recipes': [ids[0], recipes[2].id]},
+                                    format='json')
+        assert [item['status'] for item in response.json()['results']] == [
+            'exists', 'added']
+        assert self.get_favorites_counts(recipes[:4]) == {
+            recipes[0].id: 1, recipes[1].id: 1, recipes[2].id: 1,
+            recipes[3].id: 0}
+        response = user_client.delete('/api/recipes/favorite/',
+                                      data={'recipes': [ids[0],
+                                                        recipes[3].id]},
+                                      format='json')
+        assert [item['status'] for item in response.json()['results']] == [
+            'removed', 'absent']
+        assert self.get_favorites_counts(recipes[:1]) == {recipes[0].id: 0}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_author_lock(self, user, user_client, recipes):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from recipes.models import Favourite
+        from users.models import User
+
+        for method in (user_client.post, user_client.delete):
+            with CaptureQueriesContext(connection) as context:
+                method('/api/recipes/favorite/',
+                       data={'recipes': [recipes[0].id]}, format='json')
+            queries = [query['sql'] for query in context.captured_queries]
+            locks = [index for index, sql in enumerate(queries)
+                     if f'FROM "{User._meta.db_table}"' in sql]
+            writes = [index for index, sql in enumerate(queries)
+                      if f'"{Favourite._meta.db_table}"' in sql
+                      and sql.startswith(('INSERT', 'DELETE'))]
+            assert locks and writes and locks[0] < writes[0], (
+                'Проверьте, что пакетное изменение блокирует строку '
+                'пользователя до записи'
+            )
+            if connection.features.has_select_for_update:
+                assert 'FOR UPDATE' in queries[locks[0]]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_concurrent_changes(self, user, recipes):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from django.db import connection
+        from rest_framework.test import APIClient
+
+        from recipes.models import ShoppingListIngredient
+        from recipes.shopping_list import calculate_shopping_list_totals
+
+        if not connection.features.has_select_for_update:
+            pytest.skip('Блокировки строк не поддерживаются этой базой')
+        ids = [recipe.id for recipe in recipes[:3]]
+
+        def send(method, url, recipe_ids):
+            from django.db import connection
+
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                response = getattr(client, method)(
+                    url, data={'recipes': recipe_ids}, format='json')
+                return [item['status']
+                        for item in response.json()['results']]
+            finally:
+                connection.close()
+
+        for method, changed in (('post', 'added'), ('delete', 'removed')):
+            for url in ('/api/recipes/favorite/',
+                        '/api/recipes/shopping_cart/'):
+                with ThreadPoolExecutor(4) as executor:
+                    results = list(executor.map(
+                        lambda recipe_ids: send(method, url, recipe_ids),
+                        [ids, ids[::-1], ids, ids[1:]]))
+                statuses = {}
+                for recipe_ids, result in zip(
+                        [ids, ids[::-1], ids, ids[1:]], results):
+                    for recipe_id, item_status in zip(recipe_ids, result):
+                        statuses.setdefault(recipe_id, []).append(item_status)
+                assert all(items.count(changed) == 1
+                           for items in statuses.values()), (
+                    'Проверьте, что при параллельных пакетных запросах '
+                    'каждый рецепт добавляется и удаляется ровно один раз'
+                )
+            counts = dict.fromkeys(ids, 1 if method == 'post' else 0)
+            assert self.get_favorites_counts(recipes[:3]) == counts
+            stored = {
+                (total.author_id, total.ingredient_id): total.total_amount
+                for total in ShoppingListIngredient.objects.all()}
+            assert stored == calculate_shopping_list_totals(), (
+                'Проверьте, что суммы в списке покупок не искажаются '
+                'параллельными запросами'
+            )
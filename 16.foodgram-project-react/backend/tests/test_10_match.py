@@ -0,0 +1,108 @@
+import pytest
+
+
+class Test10RecipeMatchAPI:
+
+    def expected(self, ingredient_ids, min_match):
+        from recipes.models import IngredientInRecipe
+
+        counts = {}
+        for recipe_id, ingredient_id in IngredientInRecipe.objects.values_list(
+                'recipe_id', 'ingredient_id'):
+            if ingredient_id in ingredient_ids:
+                counts[recipe_id] = counts.get(recipe_id, 0) + 1
+        return sorted(((recipe_id, count)
+                       for recipe_id, count in counts.items()
+                       if count >= min_match),
+                      key=lambda match: (-match[1], -match[0]))
+
+    def match(self, client, ingredient_ids, min_match):
+        query = '&'.join(f'ingredients={ingredient_id}'
+                         for ingredient_id in ingredient_ids)
+        response = client.get(
+            f'/api/recipes/match/?{query}&min_match={min_match}&limit=50')
+        assert response.status_code == 200
+        return [(recipe['id'], recipe['matched_ingredients'])
+                for recipe in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('min_match', (1, 2, 3))
+    def test_01_match(self, guest_client, recipes, ingredients, min_match):
+        ingredient_ids = [ingredient.id for ingredient in ingredients[:3]]
+        assert self.match(guest_client, ingredient_ids, min_match) == (
+            self.expected(ingredient_ids, min_match)), (
+            'Проверьте, что `/api/recipes/match/` возвращает рецепты, в '
+            'которых есть не меньше `min_match` указанных ингредиентов, '
+            'по убыванию числа совпадений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_index_updates(self, guest_client, another_user, recipes,
+                              ingredients, tags, monkeypatch):
+        from rest_framework.test import APIClient
+
+        from recipes.catalogue import bump_version
+        from recipes.models import IngredientInRecipe
+        from recipes.recipe_index import (VERSION_NAME, record_recipe_changes,
+                                          recipe_index)
+
+        ingredient_ids = [ingredient.id for ingredient in ingredients]
+        self.match(guest_client, ingredient_ids, 1)
+        full_loads = []
+        load_postings = recipe_index._load_postings
+        monkeypatch.setattr(recipe_index, '_load_postings', lambda *args: (
+            full_loads.append(args) or load_postings(*args)))
+        author_client = APIClient()
+        author_client.force_authenticate(another_user)
+        author_client.patch(
+            f'/api/recipes/{recipes[1].id}/',
+            data={'ingredients': [{'id': ingredients[4].id, 'amount': 5}],
+                  'tags': [tags[0].id], 'cooking_time': 5},
+            format='json'
+        )
+        author_client.delete(f'/api/recipes/{recipes[3].id}/')
+        assert self.match(guest_client, ingredient_ids, 1) == (
+            self.expected(ingredient_ids, 1)), (
+            'Проверьте, что индекс ингредиентов обновляется при изменении '
+            'и удалении рецептов'
+        )
+        removed = list(IngredientInRecipe.objects.filter(
+            recipe=recipes[0]).values_list('ingredient_id', flat=True))
+        IngredientInRecipe.objects.filter(recipe=recipes[0]).delete()
+        record_recipe_changes(recipes[0].id, removed)
+        assert self.match(guest_client, ingredient_ids, 1) == (
+            self.expected(ingredient_ids, 1)), (
+            'Проверьте, что индекс применяет изменения, записанные другим '
+            'процессом'
+        )
+        assert not full_loads, (
+            'Проверьте, что изменения рецептов не перестраивают индекс '
+            'целиком'
+        )
+        IngredientInRecipe.objects.create(recipe=recipes[2],
+                                          ingredient=ingredients[0],
+                                          amount=1)
+        bump_version(VERSION_NAME)
+        assert self.match(guest_client, ingredient_ids, 1) == (
+            self.expected(ingredient_ids, 1)), (
+            'Проверьте, что индекс перестраивается, когда его версию '
+            'изменил другой процесс'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_benchmark(self, recipes, capsys):
+        from django.core.management import call_command
+
+        from recipes.models import IngredientInRecipe, RecipeIndexChange
+
+        count = IngredientInRecipe.objects.count()
+        call_command('benchmark_recipe_match', recipes=50, ingredients=10,
+                     per_recipe=3, requests=3, changes=5)
+        output = capsys.readouterr().out
+        assert '/api/recipes/match/' in output
+        assert 'Применение изменений 5 рецептов' in output
+        assert IngredientInRecipe.objects.count() == count, (
+            'Проверьте, что `benchmark_recipe_match` откатывает временные '
+            'данные'
+        )
+        assert not RecipeIndexChange.objects.exists()
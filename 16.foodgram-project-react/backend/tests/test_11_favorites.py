@@ -0,0 +1,86 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test11FavoritesCount:
+
+    def get_count(self, recipe):
+        from recipes.models import Recipe
+
+        return Recipe.objects.get(pk=recipe.pk).favorites_count
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_count_follows_favourites(self, user_client, recipes):
+        url = f'/api/recipes/{recipes[0].id}/favorite/'
+        user_client.get(url)
+        assert self.get_count(recipes[0]) == 1, (
+            'Проверьте, что при добавлении в "Избранное" увеличивается '
+            '`favorites_count` рецепта'
+        )
+        user_client.delete(url)
+        assert self.get_count(recipes[0]) == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_loaded_favourites(self, user, user_client, recipes):
+        from recipes.models import Favourite
+
+        Favourite.objects.bulk_create(
+            Favourite(author=user, recipe=recipe) for recipe in recipes[:2])
+        response = user_client.delete(
+            f'/api/recipes/{recipes[0].id}/favorite/')
+        assert response.status_code == 204, (
+            'Проверьте, что удаление из "Избранного" не падает, если '
+            'счётчик не был пересчитан после загрузки данных'
+        )
+        response = user_client.delete('/api/recipes/favorite/',
+                                      data={'recipes': [recipes[1].id]},
+                                      format='json')
+        assert response.status_code == 200
+        assert self.get_count(recipes[0]) == self.get_count(recipes[1]) == 0
+        Favourite.objects.create(author=user, recipe=recipes[2])
+        call_command('reconcile_favorites_count')
+        assert self.get_count(recipes[2]) == 1, (
+            'Проверьте, что команда `reconcile_favorites_count` '
+            'пересчитывает счётчики'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_edit_keeps_counters(self, another_user, recipes, ingredients,
+                                    tags, rf):
+        from types import SimpleNamespace
+
+        from django.contrib import admin
+        from rest_framework.test import APIRequestFactory
+
+        from recipes.models import Recipe
+        from recipes.serializer import RecipeWriteSerializer
+
+        recipe = Recipe.objects.get(pk=recipes[1].pk)
+        Recipe.objects.filter(pk=recipe.pk).update(favorites_count=5,
+                                                   renditions_ready=True)
+        request = APIRequestFactory().patch('/')
+        request.user = another_user
+        serializer = RecipeWriteSerializer(
+            recipe, context={'request': request}, partial=True,
+            data={'ingredients': [{'id': ingredients[0].id, 'amount': 5}],
+                  'tags': [tags[0].id], 'cooking_time': 7, 'name': 'Новое'}
+        )
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        stored = Recipe.objects.get(pk=recipe.pk)
+        assert (stored.name, stored.favorites_count,
+                stored.renditions_ready) == ('Новое', 5, True), (
+            'Проверьте, что при изменении рецепта через API не '
+            'перезаписываются `favorites_count` и `renditions_ready`'
+        )
+        Recipe.objects.filter(pk=recipe.pk).update(favorites_count=6)
+        recipe.cooking_time = 20
+        admin.site._registry[Recipe].save_model(
+            rf.post('/admin/'), recipe,
+            SimpleNamespace(changed_data=['cooking_time']), True)
+        stored = Recipe.objects.get(pk=recipe.pk)
+        assert (stored.cooking_time, stored.favorites_count,
+                stored.renditions_ready) == (20, 6, True), (
+            'Проверьте, что при изменении рецепта в админке не '
+            'перезаписываются `favorites_count` и `renditions_ready`'
+        )
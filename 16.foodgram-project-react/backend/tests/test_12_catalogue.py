@@ -0,0 +1,62 @@
+import pytest
+
+
+class Test12Catalogue:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_catalogue_queries(self, guest_client, tags,
+                                         monkeypatch,
+                                         django_assert_num_queries):
+        from django.core.cache import cache
+
+        from recipes import catalogue
+
+        guest_client.get('/api/tags/')
+        with django_assert_num_queries(0):
+            response = guest_client.get('/api/tags/')
+        assert len(response.json()) == len(tags), (
+            'Проверьте, что повторный GET запрос `/api/tags/` отдаётся '
+            'из памяти процесса без запросов к базе'
+        )
+        cache.set('catalogue_version:tags', 1, None)
+        with django_assert_num_queries(0):
+            guest_client.get('/api/tags/')
+        monkeypatch.setattr(catalogue, 'VERSION_CHECK_INTERVAL', 0)
+        assert catalogue.get_version('tags') == 1, (
+            'Проверьте, что версия каталога, изменённая другим процессом, '
+            'перечитывается из кеша по истечении VERSION_CHECK_INTERVAL'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_etag(self, guest_client, tags, ingredients):
+        from recipes.models import Ingredient, Tag
+
+        for url in ('/api/tags/', '/api/ingredients/'):
+            response = guest_client.get(url)
+            etag = response['ETag']
+            assert response.status_code == 200 and etag, (
+                f'Проверьте, что GET запрос `{url}` возвращает ETag'
+            )
+            response = guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Проверьте, что GET запрос `{url}` с совпадающим '
+                '`If-None-Match` возвращает 304'
+            )
+            assert response['ETag'] == etag
+        etags = {url: guest_client.get(url)['ETag']
+                 for url in ('/api/tags/', '/api/ingredients/')}
+        tag = Tag.objects.get(pk=tags[0].pk)
+        tag.name = 'Полдник'
+        tag.save()
+        ingredient = Ingredient.objects.get(pk=ingredients[0].pk)
+        ingredient.name = 'Новый ингредиент'
+        ingredient.save()
+        for url, name in (('/api/tags/', 'Полдник'),
+                          ('/api/ingredients/', 'Новый ингредиент')):
+            response = guest_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 200, (
+                f'Проверьте, что после изменения каталога `{url}` '
+                'прежний ETag больше не даёт 304'
+            )
+            assert response['ETag'] != etags[url]
+            assert name in [item['name'] for item in response.json()]
@@ -0,0 +1,153 @@
+import re
+
+import pytest
+
+URL = '/api/recipes/download_shopping_cart/'
+
+
+class Test13DownloadShoppingList:
+
+    def fill_shopping_list(self, user, count):
+        from recipes.models import Ingredient, ShoppingListIngredient
+
+        ingredients = Ingredient.objects.bulk_create(
+            Ingredient(name=f'Ингредиент {index:03}', measurement_unit='г')
+            for index in range(count)
+        )
+        ShoppingListIngredient.objects.bulk_create(
+            ShoppingListIngredient(author=user, ingredient=ingredient,
+                                   total_amount=index + 1)
+            for index, ingredient in enumerate(
+                Ingredient.objects.filter(
+                    name__in=[ingredient.name for ingredient in ingredients]
+                ).order_by('name'))
+        )
+
+    def download(self, client, **kwargs):
+        response = client.get(URL, **kwargs)
+        assert response.status_code == 200
+        return response, b''.join(response.streaming_content)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pdf_pages(self, user, user_client):
+        self.fill_shopping_list(user, 100)
+        response, content = self.download(user_client)
+        assert response['Content-Type'] == 'application/pdf'
+        assert content.startswith(b'%PDF')
+        pages = len(re.findall(rb'/Type /Page\b', content))
+        assert pages == 3, (
+            'Проверьте, что длинный список покупок в PDF переносится '
+            'на следующие страницы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_pdf_cache(self, user, user_client, monkeypatch):
+        from recipes import shopping_list
+        from recipes.models import ShoppingListIngredient
+
+        self.fill_shopping_list(user, 5)
+        _, content = self.download(user_client)
+        built = []
+        build_pdf = shopping_list.build_pdf
+        monkeypatch.setattr(
+            shopping_list, 'build_pdf',
+            lambda ingredients: built.append(ingredients) or build_pdf(
+                ingredients)
+        )
+        _, cached = self.download(user_client)
+        assert cached == content and not built, (
+            'Проверьте, что PDF для неизменного списка покупок берётся '
+            'из кеша'
+        )
+        ShoppingListIngredient.objects.filter(author=user).update(
+            total_amount=1)
+        self.download(user_client)
+        assert len(built) == 1, (
+            'Проверьте, что после изменения списка покупок PDF '
+            'создаётся заново'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_formats(self, user, user_client):
+        self.fill_shopping_list(user, 3)
+        for kwargs, content_type, extension in (
+            ({'data': {'format': 'txt'}}, 'text/plain; charset=utf-8', 'txt'),
+            ({'data': {'format': 'csv'}}, 'text/csv; charset=utf-8', 'csv'),
+            ({'HTTP_ACCEPT': 'application/json'},
+             'application/json; charset=utf-8', 'json'),
+            ({'HTTP_ACCEPT': 'text/csv'}, 'text/csv; charset=utf-8', 'csv'),
+            ({'HTTP_ACCEPT': '*/*'}, 'application/pdf', 'pdf'),
+        ):
+            response, _ = self.download(user_client, **kwargs)
+            assert response['Content-Type'] == content_type, (
+                'Проверьте, что формат списка покупок выбирается по '
+                '`?format=` и заголовку `Accept`'
+            )
+            assert response['Content-Disposition'] == (
+                f'attachment; filename="spisok.{extension}"')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_bodies(self, user, user_client):
+        import csv
+        import io
+        import json
+
+        self.fill_shopping_list(user, 3)
+        expected = [(f'Ингредиент {index:03}', 'г', index + 1)
+                    for index in range(3)]
+        _, content = self.download(user_client, data={'format': 'txt'})
+        assert content.decode() == ''.join(
+            f'{name}: {amount} {unit}\n' for name, unit, amount in expected)
+        _, content = self.download(user_client, data={'format': 'csv'})
+        assert list(csv.reader(io.StringIO(content.decode()))) == [
+            ['name', 'measurement_unit', 'amount'],
+            *([name, unit, str(amount)] for name, unit, amount in expected)
+        ]
+        _, content = self.download(user_client, data={'format': 'json'})
+        assert json.loads(content) == [
+            {'name': name, 'measurement_unit': unit, 'amount': amount}
+            for name, unit, amount in expected
+        ]
+        user.shopping_list_ingredients.all().delete()
+        _, content = self.download(user_client, data={'format': 'json'})
+        assert json.loads(content) == [], (
+            'Проверьте, что пустой список покупок в JSON выгружается '
+            'как `[]`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_benchmark_command(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from recipes.models import Ingredient
+
+        out = StringIO()
+        call_command('benchmark_shopping_list', '--ingredients', '50',
+                     '--repeat', '2', stdout=out)
+        assert [line.split(':')[0] for line in out.getvalue().splitlines()
+                ] == ['PDF без кеша', 'pdf', 'txt', 'csv', 'json']
+        assert not Ingredient.objects.exists(), (
+            'Проверьте, что benchmark_shopping_list откатывает '
+            'временные данные'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_pdf_cache_alias(self, user, user_client):
+        import hashlib
+
+        from django.core.cache import cache, caches
+
+        from recipes.shopping_list import CACHE_ALIAS, get_shopping_list
+
+        self.fill_shopping_list(user, 5)
+        _, content = self.download(user_client)
+        digest = hashlib.sha256(
+            repr(list(get_shopping_list(user))).encode()).hexdigest()
+        key = f'shopping_list_pdf:{digest}'
+        assert caches[CACHE_ALIAS].get(key) == content
+        assert cache.get(key) is None, (
+            'Проверьте, что PDF хранятся в отдельном кеше и не вытесняют '
+            'версии каталогов'
+        )
@@ -0,0 +1,74 @@
+import pytest
+
+
+class Test14IngredientSearch:
+
+    def search(self, client, name):
+        response = client.get('/api/ingredients/', data={'name': name})
+        assert response.status_code == 200
+        return [ingredient['name'] for ingredient in response.json()]
+
+    def create_ingredients(self, names):
+        from recipes.models import Ingredient
+
+        Ingredient.objects.bulk_create(
+            Ingredient(name=name, measurement_unit='г') for name in names)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_prefix_and_limit(self, guest_client):
+        from recipes.ingredient_index import AUTOCOMPLETE_LIMIT
+
+        flour = [f'мука {index:02}' for index in range(30)]
+        self.create_ingredients([*reversed(flour), 'молоко', 'масло'])
+        assert self.search(guest_client, 'мол') == ['молоко'], (
+            'Проверьте, что поиск ингредиентов возвращает только названия, '
+            'которые начинаются с переданной строки'
+        )
+        assert self.search(guest_client, 'МУК') == (
+            flour[:AUTOCOMPLETE_LIMIT]), (
+            'Проверьте, что поиск ингредиентов не зависит от регистра, '
+            'упорядочен по названию и возвращает не больше '
+            f'{AUTOCOMPLETE_LIMIT} строк'
+        )
+        assert self.search(guest_client, 'сахар') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, guest_client, monkeypatch):
+        from django.core.cache import cache
+
+        from recipes import catalogue
+        from recipes.ingredient_index import VERSION_NAME
+        from recipes.models import Ingredient
+
+        self.create_ingredients(['мука'])
+        assert self.search(guest_client, 'м') == ['мука']
+        Ingredient.objects.create(name='масло', measurement_unit='г')
+        assert self.search(guest_client, 'м') == ['масло', 'мука'], (
+            'Проверьте, что индекс поиска обновляется при сохранении '
+            'ингредиента'
+        )
+        self.create_ingredients(['молоко'])
+        assert self.search(guest_client, 'м') == ['масло', 'мука']
+        cache.set(f'catalogue_version:{VERSION_NAME}', 1, None)
+        monkeypatch.setattr(catalogue, 'VERSION_CHECK_INTERVAL', 0)
+        assert self.search(guest_client, 'м') == [
+            'масло', 'молоко', 'мука'], (
+            'Проверьте, что индекс поиска перестраивается, когда версию '
+            'ингредиентов изменил другой процесс'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_benchmark_command(self, guest_client):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command('benchmark_ingredient_search', '--ingredients', '100',
+                     '--requests', '50', stdout=out)
+        assert [line.split(':')[0] for line in out.getvalue().splitlines()
+                ] == ['Индекс в памяти', 'Запрос к базе']
+        assert self.search(guest_client, 'ингредиент') == [], (
+            'Проверьте, что benchmark_ingredient_search откатывает '
+            'временные ингредиенты и сбрасывает индекс'
+        )
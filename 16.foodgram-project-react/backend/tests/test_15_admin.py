@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+CHANGELISTS = ('/admin/recipes/recipe/', '/admin/recipes/ingredient/',
+               '/admin/recipes/ingredientinrecipe/', '/admin/users/user/',
+               '/admin/recipes/recipe/?tags__id__exact=1',
+               '/admin/recipes/recipe/?q=рецепт&o=3')
+
+
+class Test15AdminChangelists:
+
+    def add_rows(self, count):
+        from recipes.models import (Ingredient, IngredientInRecipe, Recipe,
+                                    Tag)
+        from users.models import User
+
+        User.objects.bulk_create(
+            User(username=f'load_{index}', email=f'load_{index}@foodgram.ru')
+            for index in range(count)
+        )
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Нагрузка {index}', measurement_unit='г')
+            for index in range(count)
+        )
+        authors = list(User.objects.filter(username__startswith='load_'))
+        for index, author in enumerate(authors):
+            recipe = Recipe.objects.create(
+                author=author, name=f'Нагрузочный рецепт {index}',
+                image='recipes/test.jpg', text='Описание', cooking_time=5
+            )
+            recipe.tags.set(Tag.objects.all())
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(recipe=recipe, ingredient=ingredient,
+                               amount=10)
+            for recipe, ingredient in zip(
+                Recipe.objects.filter(name__startswith='Нагрузочный'),
+                Ingredient.objects.filter(name__startswith='Нагрузка'))
+        )
+
+    def counts_all_rows(self, sql):
+        sql = sql.upper()
+        return 'COUNT(' in sql and 'WHERE' not in sql
+
+    def count_queries(self, client):
+        counts = {}
+        for url in CHANGELISTS:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200, url
+            if '?' in url:
+                assert not any(self.counts_all_rows(query['sql'])
+                               for query in context.captured_queries), (
+                    'Проверьте, что отфильтрованный список в админке не '
+                    'считает все строки таблицы'
+                )
+            counts[url] = len(context.captured_queries)
+        return counts
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_changelist_queries(self, recipes):
+        from django.test import Client
+
+        from users.models import User
+
+        admin_user = User.objects.create_superuser(
+            username='admin', email='admin@foodgram.ru', password='admin',
+            first_name='Админ', last_name='Админов')
+        client = Client()
+        client.force_login(admin_user)
+        before = self.count_queries(client)
+        self.add_rows(150)
+        after = self.count_queries(client)
+        assert after == before, (
+            'Проверьте, что количество запросов к базе на страницах списков '
+            'в админке не зависит от количества строк'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_benchmark(self, recipes, capsys):
+        from django.core.management import call_command
+
+        from recipes.models import Recipe
+
+        count = Recipe.objects.count()
+        call_command('benchmark_admin_changelist', recipes=30, repeat=1)
+        output = capsys.readouterr().out
+        assert f'Рецептов: {count + 30}' in output
+        assert 'поиск' in output and 'фильтр по тегу' in output
+        assert Recipe.objects.count() == count, (
+            'Проверьте, что `benchmark_admin_changelist` откатывает '
+            'временные рецепты'
+        )
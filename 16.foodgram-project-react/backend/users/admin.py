@@ -4,7 +4,10 @@ from .models import User
 
 
 class UserAdmin(admin.ModelAdmin):
-    list_filter = ('email', 'username')
+    list_display = ('username', 'email', 'first_name', 'last_name')
+    list_filter = ('is_staff', 'is_active')
+    search_fields = ('username', 'email')
+    show_full_result_count = False
 
 
 admin.site.register(User, UserAdmin)
@@ -21,6 +21,9 @@ class UserSerializer(serializers.ModelSerializer):
                   'first_name', 'last_name', 'is_subscribed')
 
     def get_is_subscribed(self, obj):
+        relations = self.context.get('relations')
+        if relations is not None:
+            return obj.pk in relations.following_ids
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
@@ -28,8 +31,7 @@ class UserSerializer(serializers.ModelSerializer):
         return Subscribe.objects.filter(user=user, following=obj).exists()
 
 
-class UserInSubscriptionsSerializer(serializers.ModelSerializer):
-    is_subscribed = serializers.SerializerMethodField()
+class UserInSubscriptionsSerializer(UserSerializer):
     recipes = serializers.SerializerMethodField()
     recipes_count = serializers.SerializerMethodField()
 
@@ -38,20 +40,17 @@ class UserInSubscriptionsSerializer(serializers.ModelSerializer):
         fields = ('email', 'id', 'username', 'first_name', 'last_name',
                   'is_subscribed', 'recipes', 'recipes_count')
 
-    def get_is_subscribed(self, obj):
-        request = self.context.get('request')
-        if request is None or request.user.is_anonymous:
-            return False
-        user = request.user
-        return Subscribe.objects.filter(user=user, following=obj).exists()
-
     def get_recipes(self, obj):
-        recipes = obj.recipes.all()
+        recipes = getattr(obj, 'recipes_preview', None)
+        if recipes is None:
+            recipes = obj.recipes.all()
         request = self.context.get('request')
         return FourFieldRecipeSerializer(recipes, many=True,
                                          context={'request': request}).data
 
     def get_recipes_count(self, obj):
+        if hasattr(obj, 'recipes_count'):
+            return obj.recipes_count
         return obj.recipes.count()
 
 
@@ -1,3 +1,4 @@
+from django.db.models import Count, Prefetch, prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.permissions import IsAuthenticated
@@ -7,7 +8,9 @@ from rest_framework.views import APIView
 from .models import Subscribe, User
 from .serializer import (SubscribeSerializer,
                          UserInSubscriptionsSerializer)
+from recipes.models import Recipe
 from recipes.pagination import CustomPagination
+from recipes.relations import UserRelations
 
 
 class SubscribeViewSet(APIView):
@@ -44,4 +47,30 @@ class SubscribeListViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        return User.objects.filter(following__user=user)
+        return User.objects.filter(following__user=user).annotate(
+            recipes_count=Count('recipes', distinct=True)
+        ).order_by('id')
+
+    def get_serializer(self, *args, **kwargs):
+        if args:
+            authors = args[0] if kwargs.get('many') else (args[0],)
+            kwargs['context'] = {
+                **self.get_serializer_context(),
+                'relations': UserRelations(self.request.user, (), authors)
+            }
+        return super().get_serializer(*args, **kwargs)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is None:
+            return page
+        recipes = Recipe.objects.all()
+        recipes_limit = self.request.query_params.get('recipes_limit')
+        if recipes_limit is not None and recipes_limit.isdigit():
+            recipes = recipes.latest_by_author(
+                int(recipes_limit), [author.pk for author in page])
+        prefetch_related_objects(
+            page,
+            Prefetch('recipes', queryset=recipes, to_attr='recipes_preview')
+        )
+        return page